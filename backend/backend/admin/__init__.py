@@ -2,5 +2,7 @@ from .award_admin import AwardAdmin, AwardRecipientAdmin
 from .course_admin import CourseAdmin
 from .event_admin import EventAdmin, EventParticipantAdmin
 from .member_admin import MemberAdmin
+from .outbox_email_admin import OutboxEmailAdmin
 from .publication_admin import PublicationAdmin
 from .research_project_admin import ProjectParticipantAdmin, ResearchProjectAdmin
+from .scholar_enrichment_admin import ScholarEnrichmentAdmin
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from backend.models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("kind", "subject", "status", "attempts", "queued_at", "sent_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("queued_at", "sent_at", "error")
@@ -1,10 +1,35 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
 
-from backend.models import Publication
+from backend.models import MergedPublication, Publication
+from backend.services.lab_statistics_service import LabStatisticsService
+from backend.services.publication_deduplication_service import PublicationDeduplicationService
+
+# Fields copied from a duplicate to its canonical publication when they are missing on the canonical one
+MERGED_FIELDS = ("author", "journal", "booktitle", "publisher", "year", "volume", "number", "pages", "url", "doi")
+
+
+class DuplicateFilter(admin.SimpleListFilter):
+    title = "duplicate"
+    parameter_name = "duplicate"
+
+    def lookups(self, request, model_admin):
+        return (("yes", "Suggested duplicates"), ("no", "Not duplicates"))
+
+    def queryset(self, request, queryset):
+        if self.value() == "yes":
+            return queryset.filter(duplicate_of__isnull=False)
+        if self.value() == "no":
+            return queryset.filter(duplicate_of__isnull=True)
+        return queryset
 
 
 @admin.register(Publication)
 class PublicationAdmin(admin.ModelAdmin):
+    list_display = ("title", "year", "entrytype", "is_approved", "duplicate_of")
+    list_filter = ("is_approved", DuplicateFilter)
+    search_fields = ("title", "author", "doi")
+    actions = ("find_duplicates", "merge_duplicates", "mark_not_duplicate")
 
     # Add a readonly field to display the bibtex.
     readonly_fields = ("bibtex",)
@@ -13,3 +38,38 @@ class PublicationAdmin(admin.ModelAdmin):
         return str(obj)
 
     bibtex.short_description = "Bibtex of the publication"
+
+    @admin.action(description="Find duplicated publications")
+    def find_duplicates(self, request, queryset):
+        duplicates = PublicationDeduplicationService().run()
+        self.message_user(request, f"{duplicates} publications are suggested as duplicates.")
+
+    @admin.action(description="Merge the selected duplicates into their canonical publication")
+    def merge_duplicates(self, request, queryset):
+        duplicates = queryset.filter(duplicate_of__isnull=False).select_related("duplicate_of")
+        merged = 0
+        with transaction.atomic():
+            for duplicate in duplicates:
+                canonical = duplicate.duplicate_of
+                updated_fields = [field for field in MERGED_FIELDS if not getattr(canonical, field) and getattr(duplicate, field)]
+                for field in updated_fields:
+                    setattr(canonical, field, getattr(duplicate, field))
+                if updated_fields:
+                    canonical.save(update_fields=updated_fields)
+                # The synchronisation skips the merged ids, including the ones previously merged into the duplicate
+                MergedPublication.objects.filter(publication=duplicate).update(publication=canonical)
+                MergedPublication.objects.create(id=duplicate.id, publication=canonical)
+                duplicate.delete()
+                merged += 1
+
+        if not merged:
+            self.message_user(request, "None of the selected publications are suggested duplicates.", messages.WARNING)
+            return
+        self.message_user(request, f"{merged} duplicates merged.")
+
+    @admin.action(description="Mark the selected publications as not duplicates")
+    def mark_not_duplicate(self, request, queryset):
+        with transaction.atomic():
+            updated = queryset.update(duplicate_of=None, dedup_ignored=True)
+            LabStatisticsService.schedule(Publication)
+        self.message_user(request, f"{updated} publications will no longer be suggested as duplicates.")
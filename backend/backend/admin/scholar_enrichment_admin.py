@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from backend.models import ScholarEnrichment
+
+
+@admin.register(ScholarEnrichment)
+class ScholarEnrichmentAdmin(admin.ModelAdmin):
+    list_display = ("publication", "status", "attempts", "queued_at", "last_attempt_at")
+    list_filter = ("status",)
+    readonly_fields = ("queued_at", "last_attempt_at", "error")
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    name = "backend"
+
+    def ready(self):
+        # Connects the receivers refreshing the lab statistics when the counted objects change
+        from backend.services import lab_statistics_service  # noqa: F401
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.db.models import Case, Q, Value, When
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from backend.models import Member
+
+
+class UserCache:
+    """Thread-safe LRU of the authenticated users, whose entries expire `ttl` seconds after being added."""
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._users[user_id] = (user, time.monotonic() + self.ttl)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.size:
+                self._users.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """Authenticates with a username or an email (case-insensitive) and a password, looked up with one query.
+
+    The email wins when an identifier matches the email of one user and the username of another, as before.
+    Only used with `authenticate(username_or_email=..., password=...)`: the other logins (e.g. the admin site)
+    go through `ModelBackend`.
+    """
+
+    def authenticate(self, request, username_or_email=None, password=None, **kwargs):
+        if username_or_email is None or password is None:
+            return None
+        email_match = Q(email__iexact=username_or_email)
+        user = (
+            User.objects.filter(email_match | Q(username=username_or_email))
+            .order_by(Case(When(email_match, then=Value(0)), default=Value(1)), "pk")
+            .first()
+        )
+        if user is None:
+            # Hashes the password anyway, so the response time does not tell whether the user exists
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication keeping the users (with their member profile) in a per-process cache.
+
+    The user and its member are loaded with one query (and the groups and permissions shown by the profile with
+    two more), then reused by the following requests of the same user until the entry expires or the user, its
+    member, its groups or its permissions are changed in this process. The changes made by the other processes
+    (or with `update()`) are seen after at most `AUTH_USER_CACHE_TTL` seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                users = User.objects.select_related("member").prefetch_related("groups", "user_permissions")
+                user = users.get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, user)
+
+        # Checked on each request: a deactivated user or a changed password revokes the tokens right away
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid="forget_cached_user")
+def forget_cached_user(sender, instance, **kwargs):
+    user_cache.delete(str(getattr(instance, api_settings.USER_ID_FIELD)))
+
+
+@receiver([post_save, post_delete], sender=Member, dispatch_uid="forget_cached_member")
+def forget_cached_member(sender, instance, **kwargs):
+    if instance.user_id is not None:
+        user_cache.delete(str(instance.user_id))
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid="forget_cached_user_groups")
+@receiver(m2m_changed, sender=User.user_permissions.through, dispatch_uid="forget_cached_user_permissions")
+def forget_cached_user_relations(sender, instance, action, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, User):
+        user_cache.delete(str(getattr(instance, api_settings.USER_ID_FIELD)))
+    else:
+        # Changed from the group or the permission side, for any number of users
+        user_cache.clear()
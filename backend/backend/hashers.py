@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the `PASSWORD_PBKDF2_ITERATIONS` iterations. Same algorithm as the Django hasher, so the
+    existing hashes are still checked, and upgraded (or downgraded) on login when the iterations change."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt with the `PASSWORD_SCRYPT_*` parameters. Uses 128 * work factor * block size bytes of memory."""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the `PASSWORD_ARGON2_*` parameters. Needs the argon2-cffi package."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+def get_password_hashers(policy):
+    """Returns the `PASSWORD_HASHERS` of a policy: its hasher hashes the new passwords and the others still check
+    the existing hashes, which are rehashed with the policy on the next login."""
+    preferred = settings.PASSWORD_HASHER_POLICIES[policy]
+    return [preferred] + [hasher for hasher in settings.PASSWORD_HASHER_POLICIES.values() if hasher != preferred]
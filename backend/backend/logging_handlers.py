@@ -0,0 +1,77 @@
+import atexit
+import copy
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler whose listener formats and writes the records on a background thread.
+
+    Configured with `dictConfig`, which creates the `QueueListener` with the target handlers. The listener is
+    started on the first record of each process and stopped at exit after writing the records still in the queue.
+    A process forked after the start (e.g. a gunicorn worker of a preloaded application) gets a new queue and a
+    new listener: the ones of the parent, and the locks held by its thread, are not usable in the child.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self._pid = None
+        atexit.register(self._stop_listener)
+
+    def prepare(self, record):
+        # The queue stays in the process, so the record does not need to be picklable: the arguments are merged
+        # but the exception is kept for the formatters of the target handlers (exc_info field of the JSON file)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self._start_listener()
+        super().enqueue(record)
+
+    def _start_listener(self):
+        # The lock of the handler (held by `handle()`) is reinitialized by `logging` in the forked processes
+        with self.lock:
+            if self._pid == os.getpid() or self.listener is None:
+                return
+            if self._pid is not None:
+                self.queue = queue.Queue()
+                self.listener = logging.handlers.QueueListener(
+                    self.queue, *self.listener.handlers, respect_handler_level=self.listener.respect_handler_level
+                )
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def _stop_listener(self):
+        with self.lock:
+            if self._pid == os.getpid():
+                self.listener.stop()
+                self._pid = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one record out of `rates[logger]` for the records at or below `level` of the given loggers.
+
+    Used for the loggers writing one line per item (e.g. per publication during the sync). A rate of 0 drops
+    all these records. Records above `level` and records of the other loggers always pass.
+    """
+
+    def __init__(self, rates=None, level="DEBUG"):
+        super().__init__()
+        self.rates = rates or {}
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+        self._counters = {name: itertools.count() for name in self.rates}
+
+    def filter(self, record):
+        if record.levelno > self.level:
+            return True
+        for name, rate in self.rates.items():
+            if record.name == name or record.name.startswith(f"{name}."):
+                return rate > 0 and next(self._counters[name]) % rate == 0
+        return True
@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import Engine
+from django.template.loader import render_to_string
+
+from backend.services.email_rendering_service import EMAIL_TEMPLATES, EmailRenderingService
+
+
+class Command(BaseCommand):
+    help = "Compares the time to render the invitation emails (text and HTML) with the different rendering strategies."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--renders", "-n", type=int, default=1000, help="Number of emails rendered per strategy.")
+        parser.add_argument("--repeat", "-r", type=int, default=5, help="Number of runs per strategy. The fastest one is reported.")
+
+    def handle(self, *args, **options):
+        path = EMAIL_TEMPLATES["invitation"]
+        contexts = [{"register_url": f"{settings.FRONTEND_URL}/register?token=token{i}&email=user{i}@example.com"} for i in range(options["renders"])]
+        # Same templates, compiled again on each render
+        uncached = Engine(dirs=[settings.BASE_DIR / "backend"], loaders=["django.template.loaders.filesystem.Loader"])
+        service = EmailRenderingService()
+
+        strategies = {
+            "uncached loader": lambda: [
+                (uncached.render_to_string(f"{path}.txt", c), uncached.render_to_string(f"{path}.html", c)) for c in contexts
+            ],
+            "render_to_string": lambda: [(render_to_string(f"{path}.txt", c), render_to_string(f"{path}.html", c)) for c in contexts],
+            "service render": lambda: [service.render("invitation", c) for c in contexts],
+            "service batch": lambda: service.render_many("invitation", contexts),
+        }
+
+        self.stdout.write(f"{'Strategy':<20}{'Total (ms)':>12}{'Per email (us)':>16}")
+        for name, render in strategies.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                render()
+                timings.append(time.perf_counter() - start)
+            elapsed = min(timings)
+            self.stdout.write(f"{name:<20}{elapsed * 1000:>12.1f}{elapsed / len(contexts) * 1_000_000:>16.1f}")
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from backend.hashers import get_password_hashers
+
+PASSWORD = "StrongPass123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the logins per second and per core (the logins run one after the other in this process) under each "
+        "password hashing policy, with the parameters of the settings. The test user is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", "-n", type=int, default=20, help="Number of logins per policy.")
+        parser.add_argument("--policies", nargs="+", choices=list(settings.PASSWORD_HASHER_POLICIES), default=list(settings.PASSWORD_HASHER_POLICIES))
+        parser.add_argument("--pbkdf2-iterations", nargs="+", type=int, default=[], help="Also measure PBKDF2 with these iteration counts.")
+
+    def handle(self, *args, **options):
+        variants = [(policy, policy, {}) for policy in options["policies"]]
+        variants += [(f"pbkdf2 ({iterations})", "pbkdf2", {"PASSWORD_PBKDF2_ITERATIONS": iterations}) for iterations in options["pbkdf2_iterations"]]
+
+        self.stdout.write(f"{'Policy':<20}{'Hash (ms)':>11}{'Login (ms)':>12}{'Logins/s/core':>15}")
+        for name, policy, parameters in variants:
+            with override_settings(PASSWORD_HASHERS=get_password_hashers(policy), **parameters):
+                try:
+                    hash_time = self._time(lambda: make_password(PASSWORD), 1)
+                except ValueError as e:
+                    # e.g. argon2-cffi is not installed
+                    self.stdout.write(f"{name:<20}not available: {e}")
+                    continue
+                with transaction.atomic():
+                    User.objects.create_user(username="benchmark", email="benchmark@example.com", password=PASSWORD)
+                    login_time = self._time(lambda: authenticate(username_or_email="benchmark", password=PASSWORD), options["logins"])
+                    transaction.set_rollback(True)
+            self.stdout.write(f"{name:<20}{hash_time * 1000:>11.1f}{login_time * 1000:>12.1f}{1 / login_time:>15.1f}")
+
+    def _time(self, function, count):
+        """Returns the average duration of the function, which must succeed."""
+        start = time.perf_counter()
+        for _ in range(count):
+            assert function()
+        return (time.perf_counter() - start) / count
@@ -0,0 +1,107 @@
+import csv
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.models import Award, AwardRecipient, Course, Member
+from backend.services.legacy_import_service import LegacyImportService, read_rows, split_name
+
+
+def write_files(directory, rows):
+    """Writes `rows` synthetic members, awards (two recipients each) and courses, and returns their paths."""
+    members = Path(directory, "members.csv")
+    with members.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["first_name", "last_name", "role", "email", "status", "biography"])
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({"first_name": f"First{i}", "last_name": f"Last{i}", "role": "PHD", "email": f"member{i}@example.com", "status": "CRT"})
+
+    awards = Path(directory, "awards.jsonl")
+    with awards.open("w", encoding="utf-8") as file:
+        for i in range(rows):
+            recipients = [f"First{i}, Last{i}", f"First{(i + 1) % rows}, Last{(i + 1) % rows}"]
+            file.write(json.dumps({"title": f"Award {i}", "year": str(2000 + i % 25), "organization": "ETS", "award_recipients": recipients}) + "\n")
+
+    courses = Path(directory, "courses.csv")
+    with courses.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["title", "year", "semester", "teacher", "code", "level"])
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow(
+                {"title": f"Course {i}", "year": 2000 + i % 25, "semester": "F", "teacher": f"First{i}, Last{i}", "code": f"LOG{i}", "level": "GRD"}
+            )
+
+    return {"members": members, "awards": awards, "courses": courses}
+
+
+def per_row_import(members, awards, courses):
+    """The previous import: one `update_or_create` per row and one member lookup per recipient and teacher."""
+    for row in read_rows(members):
+        fields = {name: row.get(name) or None for name in LegacyImportService.MEMBER_FIELDS}
+        Member.objects.update_or_create(first_name=row["first_name"], last_name=row["last_name"], defaults=fields)
+    for row in read_rows(awards):
+        fields = {"url": row.get("url") or None, "year": int(row["year"]), "organization": row.get("organization") or None}
+        award, _ = Award.objects.update_or_create(title=row["title"], defaults=fields)
+        for name in row["award_recipients"]:
+            first_name, last_name = split_name(name)
+            AwardRecipient.objects.get_or_create(award=award, member=Member.objects.get(first_name=first_name, last_name=last_name))
+    for row in read_rows(courses):
+        first_name, last_name = split_name(row["teacher"])
+        fields = {"teacher": Member.objects.get(first_name=first_name, last_name=last_name), "code": row["code"], "level": row["level"]}
+        Course.objects.update_or_create(title=row["title"], year=int(row["year"]), semester=row["semester"], defaults=fields)
+
+
+def bulk_import(files, batch_size):
+    LegacyImportService(batch_size=batch_size).run(**files)
+
+
+STRATEGIES = ["per-row", "bulk", "bulk-again"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the import of synthetic legacy data: ROWS members, ROWS awards with two recipients each and ROWS "
+        "courses. Each strategy starts from the current database and is rolled back at the end. The per-row "
+        "strategy runs in one transaction too, so it is faster than the autocommit import it stands for."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", "-r", type=int, default=10000, help="Number of members, awards and courses.")
+        parser.add_argument(
+            "--batch-size", type=int, default=LegacyImportService.BATCH_SIZE, help="Number of rows saved per query by the bulk import."
+        )
+        parser.add_argument(
+            "--strategies",
+            nargs="+",
+            choices=STRATEGIES,
+            default=STRATEGIES,
+            help="per-row: update_or_create per row. bulk: the bulk import. bulk-again: the bulk import of the same files a second time.",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            files = write_files(directory, options["rows"])
+
+            self.stdout.write(f"{'Strategy':<14}{'Rows':>8}{'Time (s)':>10}{'Rows/s':>10}")
+            for strategy in options["strategies"]:
+                with transaction.atomic():
+                    if strategy == "per-row":
+                        elapsed = self._time(per_row_import, **files)
+                    elif strategy == "bulk":
+                        elapsed = self._time(bulk_import, files, options["batch_size"])
+                    else:
+                        bulk_import(files, options["batch_size"])
+                        elapsed = self._time(bulk_import, files, options["batch_size"])
+                    transaction.set_rollback(True)
+
+                rows = options["rows"] * 3
+                self.stdout.write(f"{strategy:<14}{rows:>8}{elapsed:>10.2f}{rows / elapsed:>10.0f}")
+
+    def _time(self, function, *args, **kwargs):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        return time.perf_counter() - start
@@ -0,0 +1,71 @@
+import copy
+import logging
+import logging.config
+import os
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+logger = logging.getLogger("backend.benchmark")
+
+
+class Command(BaseCommand):
+    help = "Compares the latency of a request that logs, with the handlers called directly and through the background queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", "-n", type=int, default=500, help="Number of requests per configuration.")
+        parser.add_argument("--records", "-r", type=int, default=20, help="Number of records logged per request.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'Pipeline':<10}{'Level':<8}{'Mean (us)':>12}{'p95 (us)':>12}{'p99 (us)':>12}{'Drain (ms)':>12}")
+        try:
+            for level in ("INFO", "DEBUG"):
+                for pipeline in ("direct", "queue"):
+                    mean, p95, p99, drain = self._benchmark(pipeline, level, options["requests"], options["records"])
+                    self.stdout.write(f"{pipeline:<10}{level:<8}{mean:>12.1f}{p95:>12.1f}{p99:>12.1f}{drain:>12.1f}")
+        finally:
+            logging.config.dictConfig(settings.LOGGING)
+
+    def _benchmark(self, pipeline, level, requests, records):
+        """Returns the mean, p95 and p99 latency of the requests in microseconds and the time to write the remaining records."""
+        with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+            logging.config.dictConfig(self._logging_config(pipeline, level, directory, devnull))
+
+            def view(request):
+                for i in range(records):
+                    logger.info(f"Record {i} of {request.path}", extra={"event": "benchmark", "index": i})
+                    logger.debug(f"Details of record {i}")
+                return HttpResponse("ok")
+
+            factory = RequestFactory()
+            latencies = []
+            for i in range(requests):
+                request = factory.get(f"/benchmark/{i}")
+                start = time.perf_counter()
+                view(request)
+                latencies.append((time.perf_counter() - start) * 1_000_000)
+
+            start = time.perf_counter()
+            for handler in logging.getLogger().handlers:
+                if getattr(handler, "listener", None) is not None:
+                    handler.listener.stop()
+            drain = (time.perf_counter() - start) * 1000
+            logging.config.dictConfig({"version": 1, "disable_existing_loggers": False, "root": {"handlers": []}})
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        return statistics.mean(latencies), quantiles[94], quantiles[98], drain
+
+    def _logging_config(self, pipeline, level, directory, stream):
+        config = copy.deepcopy(settings.LOGGING)
+        config["handlers"]["console"]["stream"] = stream
+        config["handlers"]["file"]["filename"] = os.path.join(directory, "benchmark.log")
+        for handler in ("console", "file"):
+            config["handlers"][handler]["level"] = level
+        handlers = ["queue"] if pipeline == "queue" else ["console", "file"]
+        config["root"] = {"handlers": handlers, "level": level}
+        return config
@@ -0,0 +1,67 @@
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+PASSWORD = "StrongPass123"
+
+
+def two_lookups_login(identifier, password):
+    """The previous login: email then username lookups, then `authenticate` fetching the user again."""
+    user = User.objects.filter(email__iexact=identifier).first() or User.objects.filter(username=identifier).first()
+    return user and authenticate(username=user.username, password=password)
+
+
+def single_query_login(identifier, password):
+    return authenticate(username_or_email=identifier, password=password)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the login throughput of the user lookup strategies on a table of generated users, rolled back at "
+        "the end. The passwords are hashed with MD5 so that the lookups are measured, not the password hasher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", "-u", type=int, default=10000, help="Number of users in the table.")
+        parser.add_argument("--logins", "-n", type=int, default=1000, help="Number of logins per strategy, half by email and half by username.")
+        parser.add_argument("--repeat", "-r", type=int, default=3, help="Number of runs per strategy. The fastest one is reported.")
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._benchmark(options)
+            transaction.set_rollback(True)
+
+    def _benchmark(self, options):
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [User(username=f"benchmark{i}", email=f"Benchmark{i}@example.com", password=password) for i in range(options["users"])],
+            batch_size=1000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE "auth_user"')
+
+        step = max(1, options["users"] // options["logins"])
+        identifiers = [f"benchmark{i}@example.com" if n % 2 else f"benchmark{i}" for n, i in enumerate(range(0, options["users"], step))]
+        identifiers = (identifiers * (options["logins"] // len(identifiers) + 1))[: options["logins"]]
+        strategies = {"two lookups": two_lookups_login, "single query": single_query_login}
+
+        self.stdout.write(f"{'Strategy':<16}{'Queries/login':>15}{'Logins/s':>12}{'Per login (us)':>16}")
+        for name, login in strategies.items():
+            with CaptureQueriesContext(connection) as queries:
+                assert all(login(identifier, PASSWORD) for identifier in identifiers[:10])
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                for identifier in identifiers:
+                    login(identifier, PASSWORD)
+                timings.append(time.perf_counter() - start)
+            elapsed = min(timings)
+            self.stdout.write(
+                f"{name:<16}{len(queries) / 10:>15.1f}{len(identifiers) / elapsed:>12.0f}{elapsed / len(identifiers) * 1_000_000:>16.1f}"
+            )
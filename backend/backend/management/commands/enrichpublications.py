@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from backend.services.google_scholar_enrichment_service import GoogleScholarEnrichmentService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Completes the publications waiting in the Google Scholar queue. Resumes where the last blocked run stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            "-l",
+            type=int,
+            default=None,
+            help="Maximum number of publications to enrich during this run.",
+        )
+        parser.add_argument(
+            "--no-proxy",
+            action="store_true",
+            help="Query Google Scholar directly instead of going through free proxies.",
+        )
+
+    def handle(self, *args, **options):
+        service = GoogleScholarEnrichmentService(use_proxy=not options["no_proxy"])
+        service.run(limit=options["limit"])
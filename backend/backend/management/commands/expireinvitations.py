@@ -0,0 +1,46 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from backend.models import Invitation
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Marks the pending invitations that are past their expiry date as expired. Run it periodically (cron) or with --watch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            "-w",
+            action="store_true",
+            help="Keep running and sweep the invitations every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=3600,
+            help="Seconds between two sweeps with --watch.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["watch"]:
+            self._sweep()
+            return
+
+        try:
+            while True:
+                self._sweep()
+                # Outside of the requests, nothing closes the connections that are too old or broken
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            logger.info("Stopped sweeping the invitations.")
+
+    def _sweep(self):
+        expired = Invitation.expire_overdue()
+        if expired:
+            logger.info(f"{expired} invitations expired", extra={"event": "invitations_expired", "count": expired})
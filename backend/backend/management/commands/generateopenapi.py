@@ -0,0 +1,30 @@
+import logging
+from pathlib import Path
+
+from config.openapi import API_INFO
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Generates the OpenAPI schema loaded by the Swagger UI in production. Run it before `collectstatic`."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            "-o",
+            default=Path(settings.BASE_DIR, "backend", "static", settings.OPENAPI_SCHEMA_FILE),
+            type=Path,
+            help="Path of the generated JSON file. Defaults to the static files of the backend app.",
+        )
+
+    def handle(self, *args, **options):
+        schema = OpenAPISchemaGenerator(info=API_INFO).get_schema(request=None, public=True)
+        output = options["output"]
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(OpenAPICodecJson(validators=[]).encode(schema))
+        logger.info(f"OpenAPI schema written to {output}")
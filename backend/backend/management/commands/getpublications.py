@@ -1,18 +1,26 @@
+import cProfile
+import hashlib
+import json
 import logging
-import string
 import time
 import urllib.parse
 
 import requests
-from config.settings import BACKEND_URL, EMAIL_HOST_USER
+from config.settings import BACKEND_URL
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
 from django.core.management.base import BaseCommand
-from django.template.loader import render_to_string
-from scholarly import ProxyGenerator, scholarly
-
-from backend.models import Member, Publication
+from django.db import transaction
+from django.utils import timezone
+
+from backend.models import Member, MergedPublication, Publication, PublicationSync, PublicationSyncAuthor
+from backend.services.email_outbox_service import EmailOutboxService
+from backend.services.email_rendering_service import EmailRenderingService
+from backend.services.google_scholar_enrichment_service import GoogleScholarEnrichmentService
+from backend.services.lab_statistics_service import LabStatisticsService
+from backend.services.prometheus_metrics_service import CACHE_REQUESTS, SYNC_DURATION
+from backend.services.publication_deduplication_service import PublicationDeduplicationService
 from backend.services.publication_generator_service import PublicationGeneratorService
+from backend.services.sync_metrics_service import SyncMetricsService
 
 logger = logging.getLogger(__name__)
 
@@ -71,27 +79,63 @@ ALL_AUTHORS = [
 class Command(BaseCommand):
     help = "Updates the publications for all members of the lab."
 
-    def _set_up_scholarly(self):
-        """Creates and activates the proxy used by scholarly."""
-        pg = ProxyGenerator()
-        pg.FreeProxies()
-        scholarly.use_proxy(pg)
+    # Attempts at the pages of an author (e.g. malformed OpenAlex work, HTTP error) before skipping the author
+    MAX_AUTHOR_ATTEMPTS = 3
 
-    def _clean_title(self, publication_title):
-        """Remove any illegal characters from the publication's title"""
-        allowed = string.ascii_letters + string.digits + string.punctuation + string.whitespace
-        return "".join(character for character in publication_title if character in allowed).strip()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = SyncMetricsService()
 
     def _get_lab_members(self):
         members = Member.objects.all()
         return [m.first_name + " " + m.last_name for m in members]
 
+    def _publication_defaults(self, publication_tuple):
+        """Publication fields to save, along with the hash of their content used to detect changes between synchronisations."""
+        fields = publication_tuple[2] if publication_tuple else {}
+        defaults = {
+            "entrytype": publication_tuple[0] if publication_tuple else None,
+            "citekey": publication_tuple[1] if publication_tuple else None,
+            "title": fields.get("title"),
+            "author": fields.get("author"),
+            "journal": fields.get("journal"),
+            "booktitle": fields.get("booktitle"),
+            "publisher": fields.get("publisher"),
+            "year": fields.get("year"),
+            "volume": fields.get("volume"),
+            "number": fields.get("number"),
+            "pages": fields.get("pages"),
+            "url": fields.get("url"),
+            "doi": fields.get("doi"),
+        }
+        serialized = json.dumps(defaults, sort_keys=True, default=str)
+        defaults["content_hash"] = hashlib.sha256(serialized.encode()).hexdigest()
+        defaults["is_approved"] = False
+        return defaults
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--fast",
             "-f",
             action="store_true",
-            help="Will skip querying Google Scholar. Using this option has a high chance of returning incomplete data.",
+            help="Will skip querying Google Scholar. Using this option has a high chance of returning incomplete data. "
+            "The publications can still be completed later with the `enrichpublications` command.",
+        )
+        parser.add_argument(
+            "--profile",
+            metavar="PATH",
+            help="Write a cProfile dump of the run to PATH (open it with `python -m pstats PATH`).",
+        )
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the last interrupted synchronisation where it stopped (default).",
+        )
+        group.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard the last interrupted synchronisation and start over from the first author.",
         )
 
     def _notify_admins(self, publications_changed):
@@ -107,126 +151,205 @@ class Command(BaseCommand):
         backend_url = f"{BACKEND_URL}/admin/backend/publication/"
         context = {"publications_changed": publications_changed, "backend_url": backend_url}
 
-        text_content = render_to_string(
-            "templates/emails/notify_admins.txt",
-            context=context,
-        )
+        text_content, html_content = EmailRenderingService().render("notify_admins", context)
 
-        html_content = render_to_string(
-            "templates/emails/notify_admins.html",
-            context=context,
-        )
+        EmailOutboxService().enqueue("notify_admins", "Publications need approval", emails, text_content, html_content)
+        logger.info("Email to the admins added to the outbox.")
 
-        msg = EmailMultiAlternatives(
-            "Publications need approval",
-            text_content,
-            EMAIL_HOST_USER,
-            superusers,
-        )
+    def handle(self, *args, **options):
+        self.metrics = SyncMetricsService()
 
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
+        profile_path = options.get("profile")
+        if not profile_path:
+            self._synchronise(options)
+            return
 
-        logger.info("Email sent to admins.")
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            self._synchronise(options)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            logger.info(f"Profile of the run written to {profile_path}")
 
-    def handle(self, *args, **options):
+    def _synchronise(self, options):
         skip_google_scholar = options["fast"]
 
+        sync = self._get_sync(restart=options["restart"])
+
+        # The statistics are counted once after saving the publications and marking the duplicates
+        with LabStatisticsService.deferred():
+            for sync_author in sync.authors.filter(is_completed=False):
+                self._sync_author(sync, sync_author)
+
+            logger.info("Looking for duplicated publications...")
+            with self.metrics.stage("dedup"):
+                duplicates = PublicationDeduplicationService().run()
+            logger.info(f"{duplicates} publications are marked as duplicates")
+
+        changed = Publication.objects.filter(id__in=sync.changed_publications).only("id", "title")
+        publications_changed = [{"id": urllib.parse.quote(p.id, safe="").replace("%", "_"), "title": p.title} for p in changed]
+        # The email is sent by the `sendemails` worker, if the synchronisation is marked as completed
+        with transaction.atomic():
+            if publications_changed:
+                with self.metrics.stage("email"):
+                    self._notify_admins(publications_changed)
+
+            sync.status = PublicationSync.STATUS.COMPLETED
+            sync.finished_at = timezone.now()
+            sync.save(update_fields=["status", "finished_at"])
+
+        # The OpenAlex data is already saved, Google Scholar only completes it afterwards
+        if not skip_google_scholar:
+            scholar_service = GoogleScholarEnrichmentService()
+            with self.metrics.stage("scholar"), LabStatisticsService.deferred():
+                scholar_service.enqueue(sync.changed_publications)
+                self.metrics.increment("scholar_enriched", scholar_service.run())
+            self.metrics.increment("retries", scholar_service.failures)
+
+        SYNC_DURATION.observe(self.metrics.elapsed())
+        self.metrics.emit()
+        self.stdout.write(self.metrics.report())
+
+    def _get_sync(self, restart=False):
+        """Resumes the last interrupted synchronisation, or starts a new one with a checkpoint per author."""
+        interrupted = PublicationSync.objects.filter(status=PublicationSync.STATUS.RUNNING).order_by("-started_at")
+        if restart:
+            interrupted.update(status=PublicationSync.STATUS.ABANDONED, finished_at=timezone.now())
+        else:
+            sync = interrupted.first()
+            if sync:
+                logger.info(f"Resuming the synchronisation started at {sync.started_at}...")
+                return sync
+
         authors = self._get_lab_members()
 
         # Fallback if there are no members registered in the database
         if not authors:
             authors = ALL_AUTHORS
 
-        blocked_by_google = False
+        with transaction.atomic():
+            sync = PublicationSync.objects.create()
+            PublicationSyncAuthor.objects.bulk_create([PublicationSyncAuthor(sync=sync, name=name, position=i) for i, name in enumerate(authors)])
+        return sync
+
+    def _sync_author(self, sync, sync_author):
+        """Saves the publications of the author, then marks the author as completed.
 
-        publications_changed = []
-        for author in authors:
-            logger.info(f"Gathering publications for {author}...")
+        A page that fails is tried again from the last checkpoint. After `MAX_AUTHOR_ATTEMPTS` failed attempts (counted
+        across the resumed runs) the author is skipped with its error, so that one author cannot block the
+        synchronisation of the others.
+        """
+        author = sync_author.name
+        logger.info(f"Gathering publications for {author}...")
+        while True:
             try:
-                publications = self.get_all_openalex_publications(author)
+                self._sync_author_pages(sync, sync_author)
+                break
             except ValueError:
                 logger.info(f"Unable to retieve any publications for {author}. Skipping...")
-                continue
-            for publication in publications:
-                publication_id = publication["id"]
-                logger.info(f"Creating publication for '{publication["title"]}'")
-                try:
-                    obj = Publication.objects.get(id=publication_id)
-                    if obj.is_approved:
-                        logger.info(f"The publication '{publication["title"]}' is already in the database and is approved. Skipping...")
-                        continue
-                    else:
-                        logger.info(f"The publication '{publication["title"]}' is already in the database but is not approved. Trying to update...")
-                except Publication.DoesNotExist:
-                    logger.info(f"The publication '{publication["title"]}' is not in the database. Creating new publication...")
-                    pass
-
-                pub_gen = PublicationGeneratorService()
-                if skip_google_scholar:
-                    logger.info("Getting publication data from OpenAlex...")
-                    publication_tuple = pub_gen.generate_openalex_publication(publication)
-
-                elif not blocked_by_google:
-                    self._set_up_scholarly()
-                    publication_cleaned_title = self._clean_title(publication["title"])
-                    try:
-                        logger.info("Getting publication data from Google Scholar...")
-                        pub = scholarly.search_pubs(publication_cleaned_title)
-                        p = scholarly.fill(next(pub))
-
-                        # Scholarly needs these two fields to be able to generate a bibtex
-                        p["bib"]["ENTRYTYPE"] = "DUMMY"
-                        p["bib"]["ID"] = "DUMMY"
-
-                        publication_tuple(pub_gen.generate_google_scholar_publication(p["bib"]))
-                        time.sleep(3)  # Longer wait to not get blocked by google
-                    except Exception:
-                        logger.error("Cannot Fetch from Google Scholar.")
-                        logger.warning("Falling back to OpenAlex API.")
-                        logger.warning("Some data may be incomplete or missing.")
-
-                        # Fall back to openalex
-                        blocked_by_google = True
-                        skip_google_scholar = True
-                        publication_tuple = pub_gen.generate_openalex_publication(publication)
-                try:
-                    obj, created = Publication.objects.update_or_create(
-                        id=publication_id,
-                        defaults={
-                            "entrytype": publication_tuple[0] if publication_tuple else None,
-                            "citekey": publication_tuple[1] if publication_tuple else None,
-                            "title": publication_tuple[2].get("title") if publication_tuple else None,
-                            "author": publication_tuple[2].get("author") if publication_tuple else None,
-                            "journal": publication_tuple[2].get("journal") if publication_tuple else None,
-                            "booktitle": publication_tuple[2].get("booktitle") if publication_tuple else None,
-                            "publisher": publication_tuple[2].get("publisher") if publication_tuple else None,
-                            "year": publication_tuple[2].get("year") if publication_tuple else None,
-                            "volume": publication_tuple[2].get("volume") if publication_tuple else None,
-                            "number": publication_tuple[2].get("number") if publication_tuple else None,
-                            "pages": publication_tuple[2].get("pages") if publication_tuple else None,
-                            "url": publication_tuple[2].get("url") if publication_tuple else None,
-                            "is_approved": False,
-                        },
-                    )
-                    publications_changed.append({"id": urllib.parse.quote(obj.id, safe="").replace("%", "_"), "title": obj.title})
-                except Exception as e:
-                    logger.error(f"Error creating the publication '{publication["title"]}' - {e}")
-                    continue
-                if created:
-                    logger.info(f"Publication '{publication["title"]}' created")
-                else:
-                    logger.info(f"Publication titled - '{publication["title"]}' was already in the database")
-        if publications_changed:
-            self._notify_admins(publications_changed)
-            pass
+                break
+            except Exception as e:
+                # The failed page is rolled back: start again from the saved state
+                sync.refresh_from_db(fields=["changed_publications"])
+                sync_author.refresh_from_db(fields=["cursor"])
+                sync_author.failed_attempts += 1
+                sync_author.error = f"{type(e).__name__}: {e}"
+                sync_author.save(update_fields=["failed_attempts", "error", "updated_at"])
+                if sync_author.failed_attempts >= self.MAX_AUTHOR_ATTEMPTS:
+                    logger.error(f"Cannot gather the publications of {author} after {sync_author.failed_attempts} attempts, skipping - {e}")
+                    break
+                logger.warning(f"Cannot gather the publications of {author}, trying again from the last page saved - {e}")
+
+        sync_author.is_completed = True
+        sync_author.save(update_fields=["is_completed", "updated_at"])
+
+    def _sync_author_pages(self, sync, sync_author):
+        """Saves the publications of the author page by page, checkpointing the OpenAlex cursor after each page."""
+        for works, next_cursor in self.iter_openalex_pages(sync_author.name, cursor=sync_author.cursor):
+            # The publications of the page are committed with the checkpoint: after a crash, the resumed run
+            # saves them again and still reports them as changed
+            with transaction.atomic():
+                changed_ids = [publication_id for publication_id in map(self._sync_publication, works) if publication_id]
+
+                with self.metrics.stage("db_write"):
+                    if changed_ids:
+                        sync.changed_publications = list(dict.fromkeys(sync.changed_publications + changed_ids))
+                        sync.save(update_fields=["changed_publications"])
+                    sync_author.cursor = next_cursor or sync_author.cursor
+                    sync_author.save(update_fields=["cursor", "updated_at"])
+
+    def _sync_publication(self, publication):
+        """Saves one publication obtained from OpenAlex. Returns its id if it was created or updated."""
+        publication_id = publication["id"]
+        logger.debug(f"Creating publication for '{publication["title"]}'")
+        obj = None
+        try:
+            with self.metrics.stage("db_read"):
+                obj = Publication.objects.get(id=publication_id)
+            if obj.is_approved:
+                logger.debug(f"The publication '{publication["title"]}' is already in the database and is approved. Skipping...")
+                self.metrics.increment("skipped_approved")
+                return None
+            else:
+                logger.debug(f"The publication '{publication["title"]}' is already in the database but is not approved. Trying to update...")
+        except Publication.DoesNotExist:
+            if MergedPublication.objects.filter(id=publication_id).exists():
+                logger.debug(f"The publication '{publication["title"]}' was merged into another publication. Skipping...")
+                self.metrics.increment("skipped_merged")
+                return None
+            logger.debug(f"The publication '{publication["title"]}' is not in the database. Creating new publication...")
+
+        logger.debug("Getting publication data from OpenAlex...")
+        with self.metrics.stage("normalize"):
+            publication_tuple = PublicationGeneratorService().generate_openalex_publication(publication)
+            defaults = self._publication_defaults(publication_tuple)
+
+        if obj is not None and obj.content_hash == defaults["content_hash"]:
+            logger.debug(f"The publication '{publication["title"]}' did not change since the last synchronisation. Skipping...")
+            # The stored hash acts as a cache of the previous synchronisation
+            self.metrics.increment("cache_hits")
+            CACHE_REQUESTS.inc(cache="publication_content_hash", result="hit")
+            return None
+        CACHE_REQUESTS.inc(cache="publication_content_hash", result="miss")
+
+        try:
+            # In a savepoint, so an error only discards this publication and not the page
+            with self.metrics.stage("db_write"), transaction.atomic():
+                obj, created = Publication.objects.update_or_create(id=publication_id, defaults=defaults)
+            self.metrics.increment("rows_written")
+        except Exception as e:
+            logger.error(f"Error creating the publication '{publication["title"]}' - {e}")
+            return None
+        if created:
+            logger.debug(f"Publication '{publication["title"]}' created")
+        else:
+            logger.debug(f"Publication titled - '{publication["title"]}' was already in the database")
+        return obj.id
 
     def get_all_openalex_publications(self, author_name):
         """Gather all publications of the author with the OpenAlex API. The results may be incomplete."""
+        all_works = []
+        for works, _ in self.iter_openalex_pages(author_name):
+            all_works.extend(works)
+
+        logger.info(f"Successfully fetched {len(all_works)} publications")
+        return all_works
+
+    def iter_openalex_pages(self, author_name, cursor="*"):
+        """Yields the author's publications one OpenAlex page at a time, along with the cursor of the next page.
+
+        Starting from a saved cursor resumes the pagination where a previous run stopped.
+        """
 
         # Get the author OpenAlex ID
-        res = requests.get("https://api.openalex.org/authors", params={"search": author_name})
-        authors = res.json().get("results", [])
+        with self.metrics.stage("author_search"):
+            res = requests.get("https://api.openalex.org/authors", params={"search": author_name})
+        with self.metrics.stage("json_decode"):
+            authors = res.json().get("results", [])
+        self.metrics.increment("requests")
+        self.metrics.increment("bytes", len(res.content))
         if not authors:
             error = f"Unable to find author '{author_name}' with the OpenAlex API."
             logger.error(error)
@@ -237,8 +360,7 @@ class Command(BaseCommand):
 
         # Get all the author's publications available with the OpenAlex API
         publications_url = "https://api.openalex.org/works"
-        cursor = "*"
-        all_works = []
+        fetched = 0
         logger.info("Fetching publications...")
         while True:
             params = {
@@ -246,18 +368,20 @@ class Command(BaseCommand):
                 "per-page": 100,
                 "cursor": cursor,
             }
-            response = requests.get(publications_url, params=params)
-            data = response.json()
-
-            all_works.extend(data["results"])
-
+            with self.metrics.stage("page_fetch"):
+                response = requests.get(publications_url, params=params)
+            with self.metrics.stage("json_decode"):
+                data = response.json()
+            self.metrics.increment("requests")
+            self.metrics.increment("bytes", len(response.content))
+
+            fetched += len(data["results"])
             cursor = data["meta"].get("next_cursor")
+            yield data["results"], cursor
+
             if not cursor:
                 break
 
-            logger.info(f"Fetched {len(all_works)} / {data['meta']['count']} publications...")
+            logger.info(f"Fetched {fetched} / {data['meta']['count']} publications...")
 
             time.sleep(1)  # Wait to not get blocked by OpenAlex
-
-        logger.info(f"Successfully fetched {len(all_works)} publications")
-        return all_works
@@ -0,0 +1,50 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from backend.services.email_outbox_service import EmailOutboxService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Sends the emails waiting in the outbox (invitations, notifications of the admins, ...) over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            "-l",
+            type=int,
+            default=None,
+            help="Maximum number of emails to send during this run.",
+        )
+        parser.add_argument(
+            "--watch",
+            "-w",
+            action="store_true",
+            help="Keep running and send the new emails as they are added to the outbox.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds between two checks of the outbox with --watch.",
+        )
+
+    def handle(self, *args, **options):
+        service = EmailOutboxService()
+        if not options["watch"]:
+            service.run(limit=options["limit"])
+            return
+
+        logger.info("Watching the email outbox...")
+        try:
+            while True:
+                service.run(limit=options["limit"])
+                # Outside of the requests, nothing closes the connections that are too old or broken
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            logger.info("Stopped watching the email outbox.")
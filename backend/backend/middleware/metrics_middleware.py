@@ -0,0 +1,50 @@
+import time
+
+from django.db import connection
+
+from backend.services.prometheus_metrics_service import (
+    DB_QUERIES,
+    DB_QUERY_DURATION,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+)
+
+
+class QueryCounter:
+    """`connection.execute_wrapper` hook counting the queries of a request and the time spent running them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class PrometheusMetricsMiddleware:
+    """Records the request count, latency and database usage of every view for the `/metrics` endpoint."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        # The route (api/invitation/<int:id>) keeps the number of label values small, unlike the path
+        match = getattr(request, "resolver_match", None)
+        view = match.route if match else "<unmatched>"
+
+        HTTP_REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        HTTP_REQUEST_DURATION.observe(duration, view=view, method=request.method)
+        DB_QUERIES.observe(queries.count, view=view)
+        DB_QUERY_DURATION.observe(queries.duration, view=view)
+        return response
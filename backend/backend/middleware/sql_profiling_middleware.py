@@ -0,0 +1,103 @@
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Literals and placeholder lists are replaced so the same statement with other parameters has the same fingerprint
+_IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalized form of a statement, identical for the queries that only differ by their parameters."""
+    sql = _IN_LIST.sub("(...)", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryProfiler:
+    """`connection.execute_wrapper` hook keeping the duration of every query of a request."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self, threshold):
+        """Fingerprints run at least `threshold` times, most repeated first. Usually an N+1 query."""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return [{"sql": sql, "count": count} for sql, count in counts.most_common() if count >= threshold]
+
+    def slowest(self, limit):
+        queries = sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+        return [{"sql": sql, "ms": round(duration * 1000, 1)} for sql, duration in queries]
+
+
+class SQLProfilingMiddleware:
+    """Profiles the database queries of every request. Enabled with `SQL_PROFILING=True`.
+
+    Adds a `Server-Timing` header with the time spent in the database and in the rest of the application, and
+    logs the requests that are slower or run more queries than the thresholds, with their repeated and slowest
+    statements, as `slow_request` JSON events.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_PROFILING:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profiler = QueryProfiler()
+        start = time.perf_counter()
+        with connection.execute_wrapper(profiler):
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        db = profiler.duration
+
+        response["Server-Timing"] = (
+            f'db;dur={db * 1000:.1f};desc="{profiler.count} queries", app;dur={(total - db) * 1000:.1f}, total;dur={total * 1000:.1f}'
+        )
+        # Lets the frontend read the header from another origin with the Resource Timing API
+        response["Timing-Allow-Origin"] = ", ".join(settings.CORS_ALLOWED_ORIGINS)
+
+        duplicates = profiler.duplicates(settings.SQL_PROFILING_DUPLICATE_THRESHOLD)
+        if total * 1000 >= settings.SQL_PROFILING_SLOW_REQUEST_MS or profiler.count >= settings.SQL_PROFILING_MAX_QUERIES or duplicates:
+            match = getattr(request, "resolver_match", None)
+            logger.warning(
+                f"{request.method} {request.path} took {total * 1000:.0f}ms with {profiler.count} queries",
+                extra={
+                    "event": "slow_request",
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.route if match else None,
+                    "status": response.status_code,
+                    "total_ms": round(total * 1000, 1),
+                    "db_ms": round(db * 1000, 1),
+                    "queries": profiler.count,
+                    "duplicates": duplicates,
+                    "slowest": profiler.slowest(settings.SQL_PROFILING_SLOWEST_QUERIES),
+                },
+            )
+        return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0010_invitation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="publication",
+            name="dedup_ignored",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="publication",
+            name="doi",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="publication",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="duplicates", to="backend.publication"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0011_publication_deduplication"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="publication",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+    ]
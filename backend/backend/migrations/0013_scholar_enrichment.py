@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:06
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0012_publication_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScholarEnrichment",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(choices=[("pending", "Pending"), ("done", "Done"), ("failed", "Failed")], default="pending", max_length=10),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+                ("last_attempt_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                (
+                    "publication",
+                    models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="scholar_enrichment", to="backend.publication"),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["status", "queued_at"], name="backend_sch_status_7fc853_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:07
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0013_scholar_enrichment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublicationSync",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "Running"), ("completed", "Completed"), ("abandoned", "Abandoned")], default="running", max_length=10
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("changed_publications", models.JSONField(blank=True, default=list)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PublicationSyncAuthor",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=255)),
+                ("position", models.PositiveIntegerField()),
+                ("cursor", models.CharField(default="*", max_length=255)),
+                ("is_completed", models.BooleanField(default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("sync", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="authors", to="backend.publicationsync")),
+            ],
+            options={
+                "ordering": ["position"],
+                "constraints": [models.UniqueConstraint(fields=("sync", "position"), name="unique_sync_author_position")],
+            },
+        ),
+    ]
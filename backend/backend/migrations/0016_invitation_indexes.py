@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0015_outbox_email"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invitation",
+            index=models.Index(fields=["status", "expires_at"], name="backend_inv_status_6b5de5_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invitation",
+            index=models.Index(fields=["email", "token"], name="backend_inv_email_2ab556_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0016_invitation_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invitation",
+            index=models.Index(fields=["sent_at", "id"], name="backend_inv_sent_at_bca369_idx"),
+        ),
+    ]
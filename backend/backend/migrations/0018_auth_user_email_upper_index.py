@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 20:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("backend", "0017_invitation_sent_at_index"),
+    ]
+
+    # auth_user belongs to django.contrib.auth: the index matches the expression of `email__iexact` lookups
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS "auth_user_email_upper_idx" ON "auth_user" (UPPER("email"::text))',
+            reverse_sql='DROP INDEX IF EXISTS "auth_user_email_upper_idx"',
+        ),
+    ]
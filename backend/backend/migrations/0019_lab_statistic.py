@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0018_auth_user_email_upper_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LabStatistic",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("subject", models.CharField(max_length=20)),
+                ("group", models.CharField(blank=True, default="", max_length=20)),
+                ("key", models.CharField(blank=True, default="", max_length=20)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("subject", "group", "key"), name="unique_lab_statistic")],
+            },
+        ),
+    ]
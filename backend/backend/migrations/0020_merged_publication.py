@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0019_lab_statistic"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MergedPublication",
+            fields=[
+                ("id", models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ("merged_at", models.DateTimeField(auto_now_add=True)),
+                ("publication", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="merged", to="backend.publication")),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0020_merged_publication"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="publicationsyncauthor",
+            name="error",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="publicationsyncauthor",
+            name="failed_attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -5,11 +5,17 @@ from .course import Course
 from .event import Event
 from .event_participant import EventParticipant
 from .invitation import Invitation
+from .lab_statistic import LabStatistic
 from .member import Member
+from .merged_publication import MergedPublication
+from .outbox_email import OutboxEmail
 from .project_participant import ProjectParticipant
 from .publication import Publication
 from .publication_author import PublicationAuthor
+from .publication_sync import PublicationSync
+from .publication_sync_author import PublicationSyncAuthor
 from .research_project import ResearchProject
+from .scholar_enrichment import ScholarEnrichment
 
 __all__ = [
     "Member",
@@ -24,4 +30,10 @@ __all__ = [
     "AwardRecipient",
     "Course",
     "Invitation",
+    "LabStatistic",
+    "OutboxEmail",
+    "ScholarEnrichment",
+    "PublicationSync",
+    "PublicationSyncAuthor",
+    "MergedPublication",
 ]
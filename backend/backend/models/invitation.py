@@ -24,6 +24,19 @@ class Invitation(models.Model):
     expires_at = models.DateTimeField()
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "expires_at"]),
+            models.Index(fields=["email", "token"]),
+            # Invitation history, most recent first
+            models.Index(fields=["sent_at", "id"]),
+        ]
+
+    @classmethod
+    def expire_overdue(cls):
+        """Marks the pending invitations that are past their expiry date as expired, with one UPDATE. Returns their number."""
+        return cls.objects.filter(status=cls.STATUS_PENDING, expires_at__lte=timezone.now()).update(status=cls.STATUS_EXPIRED)
+
     def is_valid(self):
         return self.status == self.STATUS_PENDING and self.expires_at > timezone.now()
 
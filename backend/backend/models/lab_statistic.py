@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class LabStatistic(models.Model):
+    """One count shown by the home page and the dashboard, e.g. the number of professors among the members.
+
+    The `group` and `key` of the total of a subject are empty. Refreshed by `LabStatisticsService` when the
+    counted objects change, so the statistics are read from this small table instead of counting the objects.
+    """
+
+    subject = models.CharField(max_length=20)
+    group = models.CharField(max_length=20, blank=True, default="")
+    # Value of the group (e.g. "PRO" for the role, "2024" for the year), empty for the objects without a value
+    key = models.CharField(max_length=20, blank=True, default="")
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["subject", "group", "key"], name="unique_lab_statistic")]
+
+    def __str__(self):
+        return f"{self.subject} {self.group} {self.key}: {self.count}"
@@ -35,5 +35,10 @@ class Member(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True)
     status = models.CharField(max_length=3, choices=MemberStatus.choices, null=True)
 
+    @classmethod
+    def visible(cls):
+        """The members without an account and the members whose account is active, shown by the public pages."""
+        return cls.objects.filter(models.Q(user__isnull=True) | models.Q(user__is_active=True))
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -0,0 +1,17 @@
+from django.db import models
+
+from .publication import Publication
+
+
+class MergedPublication(models.Model):
+    """OpenAlex id of a duplicate merged into its canonical publication by an admin.
+
+    The duplicate itself is deleted: its id is kept so the synchronisation does not create it again.
+    """
+
+    id = models.CharField(max_length=255, primary_key=True)
+    publication = models.ForeignKey(Publication, on_delete=models.CASCADE, related_name="merged")
+    merged_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.id} merged into {self.publication_id}"
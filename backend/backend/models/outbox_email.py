@@ -0,0 +1,37 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    """Email waiting to be sent by the `sendemails` worker.
+
+    Saved in the same transaction as the change that triggers it (e.g. the invitation), so the email is sent if
+    and only if the change is committed, and the request does not wait for the SMTP server.
+    """
+
+    class STATUS(models.TextChoices):
+        PENDING = "pending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50)
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    body = models.TextField()
+    html_body = models.TextField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS.choices, default=STATUS.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.kind} to {', '.join(self.to)} ({self.status})"
@@ -34,9 +34,18 @@ class Publication(models.Model):
     number = models.CharField(max_length=255, null=True, blank=True)
     pages = models.CharField(max_length=255, null=True, blank=True)
     url = models.CharField(max_length=255, null=True, blank=True)
+    doi = models.CharField(max_length=255, null=True, blank=True)
 
     is_approved = models.BooleanField(default=False)
 
+    # SHA-256 of the fields obtained during the last synchronisation, used to skip the publications that did not change
+    content_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    # Set by the deduplication stage when this publication is another version of an existing one (preprint, conference version, ...)
+    duplicate_of = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="duplicates")
+    # Set by an admin when the publication was wrongly suggested as a duplicate
+    dedup_ignored = models.BooleanField(default=False)
+
     def __str__(self):
         """This is the publication's Bibtex"""
         lines = [f"@{self.entrytype}{{{self.citekey},"]
@@ -61,5 +70,7 @@ class Publication(models.Model):
             lines.append(f"  pages={{{self.pages}}},")
         if self.url:
             lines.append(f"  url={{{self.url}}},")
+        if self.doi:
+            lines.append(f"  doi={{{self.doi}}},")
         lines.append("}")
         return "\n".join(lines)
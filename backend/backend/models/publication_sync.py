@@ -0,0 +1,22 @@
+import uuid
+
+from django.db import models
+
+
+class PublicationSync(models.Model):
+    """A run of the `getpublications` command. Kept until completion so an interrupted run can be resumed."""
+
+    class STATUS(models.TextChoices):
+        RUNNING = "running"
+        COMPLETED = "completed"
+        ABANDONED = "abandoned"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS.choices, default=STATUS.RUNNING)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Ids of the publications created or updated so far, reported to the admins at the end of the run
+    changed_publications = models.JSONField(default=list, blank=True)
+
+    def __str__(self):
+        return f"Sync {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
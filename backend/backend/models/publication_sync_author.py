@@ -0,0 +1,27 @@
+import uuid
+
+from django.db import models
+
+from .publication_sync import PublicationSync
+
+
+class PublicationSyncAuthor(models.Model):
+    """Checkpoint of one author of a synchronisation: the next OpenAlex page to fetch and whether the author is done."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sync = models.ForeignKey(PublicationSync, on_delete=models.CASCADE, related_name="authors")
+    name = models.CharField(max_length=255)
+    position = models.PositiveIntegerField()
+    cursor = models.CharField(max_length=255, default="*")
+    is_completed = models.BooleanField(default=False)
+    # Failed attempts at fetching the pages of the author, and the last error. Skipped after too many failures
+    failed_attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["position"]
+        constraints = [models.UniqueConstraint(fields=["sync", "position"], name="unique_sync_author_position")]
+
+    def __str__(self):
+        return f"{self.name} ({'completed' if self.is_completed else self.cursor})"
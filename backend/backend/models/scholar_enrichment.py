@@ -0,0 +1,28 @@
+import uuid
+
+from django.db import models
+
+from .publication import Publication
+
+
+class ScholarEnrichment(models.Model):
+    """Queue of the publications that still need to be completed with the data from Google Scholar."""
+
+    class STATUS(models.TextChoices):
+        PENDING = "pending"
+        DONE = "done"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    publication = models.OneToOneField(Publication, on_delete=models.CASCADE, related_name="scholar_enrichment")
+    status = models.CharField(max_length=10, choices=STATUS.choices, default=STATUS.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "queued_at"])]
+
+    def __str__(self):
+        return f"{self.publication_id} ({self.status})"
@@ -85,12 +85,7 @@ class LoginSerializer(serializers.Serializer):
         identifier = data["username_or_email"]
         password = data["password"]
 
-        user = User.objects.filter(email__iexact=identifier).first() or User.objects.filter(username=identifier).first()
-
-        if user is None:
-            raise serializers.ValidationError("Invalid username/email or password.")
-
-        user = authenticate(username=user.username, password=password)
+        user = authenticate(self.context.get("request"), username_or_email=identifier, password=password)
 
         if not user:
             raise serializers.ValidationError("Invalid username/email or password.")
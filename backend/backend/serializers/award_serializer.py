@@ -3,7 +3,7 @@ from rest_framework import serializers
 
 from ..models.award import Award
 from ..models.award_recipient import AwardRecipient
-from ..models.member import Member
+from .member_links import set_member_links
 
 
 class AwardRecipientSerializer(serializers.Serializer):
@@ -37,13 +37,23 @@ class AwardSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             recipients_data = validated_data.pop("recipients", [])
             award = Award.objects.create(**validated_data)
-
-            for recipient_data in recipients_data:
-                member = Member.objects.get(id=recipient_data["id"])
-                AwardRecipient.objects.create(award=award, member=member)
+            if recipients_data:
+                self.save_related([award], [recipients_data])
 
         return award
 
+    def pop_related(self, attrs):
+        return attrs.pop("recipients", None)
+
+    def save_related(self, awards, recipients):
+        """Sets the recipients of the awards. `None` leaves the recipients of an award unchanged."""
+        changed = [
+            (award, [recipient["id"] for recipient in award_recipients])
+            for award, award_recipients in zip(awards, recipients)
+            if award_recipients is not None
+        ]
+        set_member_links(AwardRecipient, "award", changed, field="recipients")
+
     def update(self, instance, validated_data):
         recipients_data = validated_data.pop("recipients", [])
 
@@ -52,11 +62,6 @@ class AwardSerializer(serializers.ModelSerializer):
 
         with transaction.atomic():
             instance.save()
-
-            if recipients_data is not None:
-                AwardRecipient.objects.filter(award=instance).delete()
-                for recipient_data in recipients_data:
-                    member = Member.objects.get(id=recipient_data["id"])
-                    AwardRecipient.objects.create(award=instance, member=member)
+            self.save_related([instance], [recipients_data])
 
         return instance
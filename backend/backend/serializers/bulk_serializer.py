@@ -0,0 +1,69 @@
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """List serializer saving all the items with one `bulk_create`/`bulk_update` instead of one query per item.
+
+    The child serializer can implement `pop_related(attrs)` and `save_related(instances, related)` to save in bulk
+    the relations that are not columns of the model (e.g. the recipients of an award).
+    """
+
+    @cached_property
+    def instances_by_id(self):
+        return {str(instance.pk): instance for instance in self.instance or []}
+
+    def to_internal_value(self, data):
+        if self.instance is None:
+            return super().to_internal_value(data)
+
+        # DRF gives the whole list of instances to the child: each item is validated against its own instance, so
+        # the unique validators exclude it
+        validated, errors = [], []
+        for item in data:
+            self.child.instance = self.instances_by_id.get(str(item.get("id")))
+            try:
+                validated.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+        self.child.instance = None
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        related = [self._pop_related(attrs) for attrs in validated_data]
+        instances = model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+        self._save_related(instances, related)
+        return instances
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        pk_name = model._meta.pk.name
+        instances, related, fields = [], [], set()
+        # The ids are read-only for most models, so the instances are matched with the initial data (same order)
+        for item, attrs in zip(self.initial_data, validated_data):
+            obj = self.instances_by_id[str(item["id"])]
+            related.append(self._pop_related(attrs))
+            attrs.pop(pk_name, None)
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            fields.update(attrs)
+            instances.append(obj)
+
+        if fields:
+            model.objects.bulk_update(instances, fields)
+        self._save_related(instances, related)
+        return instances
+
+    def _pop_related(self, attrs):
+        pop_related = getattr(self.child, "pop_related", None)
+        return pop_related(attrs) if pop_related else None
+
+    def _save_related(self, instances, related):
+        save_related = getattr(self.child, "save_related", None)
+        if save_related:
+            save_related(instances, related)
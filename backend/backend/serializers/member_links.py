@@ -0,0 +1,40 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework import serializers
+
+from ..models.member import Member
+
+
+def set_member_links(link_model, owner_field, owners_member_ids, field="members"):
+    """Sets the members linked to each owner (award recipients, project participants...) in a constant number of queries.
+
+    `owners_member_ids` is a list of `(owner, member ids)`. The links that stay are left untouched: only the missing
+    ones are created and the removed ones deleted. Unknown member ids raise a validation error on `field`.
+    """
+    if not owners_member_ids:
+        return
+
+    member_ids = {member_id for _, ids in owners_member_ids for member_id in ids}
+    members = Member.objects.in_bulk(member_ids)
+    unknown = member_ids - members.keys()
+    if unknown:
+        raise serializers.ValidationError({field: [f"No member with the id {member_id}." for member_id in sorted(map(str, unknown))]})
+
+    owner_id_field = f"{owner_field}_id"
+    desired = {(owner.pk, member_id) for owner, ids in owners_member_ids for member_id in ids}
+    existing = set(
+        link_model.objects.filter(**{f"{owner_id_field}__in": [owner.pk for owner, _ in owners_member_ids]}).values_list(owner_id_field, "member_id")
+    )
+
+    removed = existing - desired
+    if removed:
+        by_owner = {}
+        for owner_id, member_id in removed:
+            by_owner.setdefault(owner_id, []).append(member_id)
+        link_model.objects.filter(reduce(or_, (Q(**{owner_id_field: owner_id, "member_id__in": ids}) for owner_id, ids in by_owner.items()))).delete()
+
+    added = desired - existing
+    if added:
+        link_model.objects.bulk_create([link_model(**{owner_id_field: owner_id, "member_id": member_id}) for owner_id, member_id in added])
@@ -12,6 +12,30 @@ class MemberSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class MemberDirectorySerializer(serializers.ModelSerializer):
+    """Fields of the members shown in the directory. The biography and the contact details are only returned by the
+    detail endpoint."""
+
+    class Meta:
+        model = Member
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "role",
+            "status",
+            "research_domain",
+            "image_url",
+            "github_url",
+            "linkedin_url",
+            "stackoverflow_url",
+            "twitter_x_url",
+            "google_scholar_url",
+            "dblp_url",
+            "personal_website",
+        ]
+
+
 class CreateMemberSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(max_length=255)
     last_name = serializers.CharField(max_length=255)
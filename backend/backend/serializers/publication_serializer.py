@@ -22,6 +22,7 @@ class PublicationSerializer(serializers.ModelSerializer):
             "number",
             "pages",
             "url",
+            "doi",
             "is_approved",
             "bibtex",
         ]
@@ -1,9 +1,9 @@
 from django.db import transaction
 from rest_framework import serializers
 
-from ..models.member import Member
 from ..models.project_participant import ProjectParticipant
 from ..models.research_project import ResearchProject
+from .member_links import set_member_links
 
 
 class LeaderSerializer(serializers.ModelSerializer):
@@ -66,24 +66,24 @@ class ResearchSerializer(serializers.ModelSerializer):
         members_data = validated_data.pop("participants", [])
         with transaction.atomic():
             project = ResearchProject.objects.create(**validated_data)
-
-            for member_data in members_data:
-                member = Member.objects.get(id=member_data["id"])
-                ProjectParticipant.objects.create(project=project, member=member)
+            if members_data:
+                self.save_related([project], [members_data])
         return project
 
+    def pop_related(self, attrs):
+        return attrs.pop("participants", None)
+
+    def save_related(self, projects, participants):
+        """Sets the participants of the projects. `None` leaves the participants of a project unchanged."""
+        changed = [(project, [member["id"] for member in members]) for project, members in zip(projects, participants) if members is not None]
+        set_member_links(ProjectParticipant, "project", changed, field="participants")
+
     def update(self, instance, validated_data):
         members_data = validated_data.pop("participants", None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         with transaction.atomic():
             instance.save()
-
-            if members_data is not None:
-                ProjectParticipant.objects.filter(project=instance).delete()
-
-                for member_data in members_data:
-                    member = Member.objects.get(id=member_data["id"])
-                    ProjectParticipant.objects.create(project=instance, member=member)
+            self.save_related([instance], [members_data])
 
         return instance
@@ -0,0 +1,142 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+
+from backend.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """Sends the emails saved in the outbox by the requests and the commands.
+
+    The pending emails are sent in batches over a single SMTP connection. An email that cannot be sent is tried
+    again later, with a delay that doubles after each attempt, and is marked as failed after `MAX_ATTEMPTS`.
+    The rows of a batch are locked while it is sent, so several workers never send the same email.
+    """
+
+    BATCH_SIZE = 50
+    MAX_ATTEMPTS = 5
+    MIN_RETRY_DELAY = 30
+    MAX_RETRY_DELAY = 3600
+
+    def __init__(self, connection=None):
+        self.connection = connection
+
+    def enqueue(self, kind, subject, to, body, html_body=None):
+        """Adds an email to the outbox. Call it in the transaction of the change that triggers the email."""
+        return OutboxEmail.objects.create(
+            kind=kind, subject=subject, from_email=settings.EMAIL_HOST_USER, to=list(to), body=body, html_body=html_body
+        )
+
+    def enqueue_many(self, kind, subject, emails):
+        """Adds the `(to, body, html body)` emails to the outbox with one query."""
+        return OutboxEmail.objects.bulk_create(
+            [
+                OutboxEmail(kind=kind, subject=subject, from_email=settings.EMAIL_HOST_USER, to=list(to), body=body, html_body=html_body)
+                for to, body, html_body in emails
+            ]
+        )
+
+    def run(self, limit=None):
+        """Sends the pending emails that are due, oldest first. Returns the number of emails sent."""
+        sent = 0
+        connection = self.connection or get_connection()
+        try:
+            while limit is None or sent < limit:
+                batch_size = self.BATCH_SIZE if limit is None else min(self.BATCH_SIZE, limit - sent)
+                batch_sent, batch_count = self._send_batch(connection, batch_size)
+                sent += batch_sent
+                if batch_count < batch_size:
+                    break
+        finally:
+            connection.close()
+
+        if sent:
+            logger.info(f"{sent} emails sent", extra={"event": "outbox_sent", "count": sent})
+        return sent
+
+    def _send_batch(self, connection, batch_size):
+        """Sends one batch of due emails. Returns the number of emails sent and the number of emails in the batch."""
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmail.STATUS.PENDING, next_attempt_at__lte=timezone.now())
+                .order_by("queued_at")[:batch_size]
+            )
+            if not emails:
+                return 0, 0
+
+            sent = 0
+            for email in emails:
+                if self._send(connection, email):
+                    sent += 1
+            OutboxEmail.objects.bulk_update(emails, ["status", "attempts", "next_attempt_at", "sent_at", "error"])
+        return sent, len(emails)
+
+    def _send(self, connection, email):
+        message = EmailMultiAlternatives(email.subject, email.body, email.from_email, email.to, connection=connection)
+        if email.html_body:
+            message.attach_alternative(email.html_body, "text/html")
+
+        email.attempts += 1
+        try:
+            # Opened once for the whole run (and after a failure): `send_messages` only closes the connections it opens
+            connection.open()
+            connection.send_messages([message])
+        except Exception as e:
+            # The connection may be broken: it is opened again for the next email
+            connection.close()
+            email.error = str(e)
+            if email.attempts >= self.MAX_ATTEMPTS:
+                email.status = OutboxEmail.STATUS.FAILED
+                logger.error(f"Cannot send the {email.kind} email to {', '.join(email.to)}, giving up - {e}")
+            else:
+                delay = min(self.MAX_RETRY_DELAY, self.MIN_RETRY_DELAY * 2 ** (email.attempts - 1))
+                email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+                logger.warning(f"Cannot send the {email.kind} email to {', '.join(email.to)}, next attempt in {delay}s - {e}")
+            return False
+
+        email.status = OutboxEmail.STATUS.SENT
+        email.sent_at = timezone.now()
+        email.error = None
+        return True
+
+    @staticmethod
+    def count_emails():
+        """Returns the number of emails sent, retried (failed attempts followed by another one) and failed, by kind."""
+        counts = {}
+        for row in OutboxEmail.objects.order_by().values("kind", "status").annotate(count=Count("pk"), attempts=Sum("attempts")):
+            kind, count = row["kind"], row["count"]
+            if row["status"] != OutboxEmail.STATUS.PENDING:
+                counts[(kind, row["status"])] = count
+            # Every attempt but the one that sent the email (or gave up) was retried
+            retried = row["attempts"] - (0 if row["status"] == OutboxEmail.STATUS.PENDING else count)
+            counts[(kind, "retried")] = counts.get((kind, "retried"), 0) + retried
+        return counts
+
+    @staticmethod
+    def delivery_durations(buckets):
+        """Returns the number of sent emails in each bucket of time between their queuing and their sending (the
+        last one being +Inf), and the sum of these times, by kind. Counted with one query."""
+        duration = ExpressionWrapper(F("sent_at") - F("queued_at"), output_field=DurationField())
+        cumulative = {f"le_{i}": Count("pk", filter=Q(duration__lte=timedelta(seconds=bound))) for i, bound in enumerate(buckets)}
+        rows = (
+            OutboxEmail.objects.filter(status=OutboxEmail.STATUS.SENT)
+            .annotate(duration=duration)
+            .order_by()
+            .values("kind")
+            .annotate(count=Count("pk"), total=Sum("duration"), **cumulative)
+        )
+
+        durations = {}
+        for row in rows:
+            cumulative_counts = [row[f"le_{i}"] for i in range(len(buckets))] + [row["count"]]
+            counts = [count - previous for count, previous in zip(cumulative_counts, [0] + cumulative_counts[:-1])]
+            durations[(row["kind"],)] = (counts, row["total"].total_seconds())
+        return durations
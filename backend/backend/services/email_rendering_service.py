@@ -0,0 +1,51 @@
+from functools import lru_cache
+
+from django.dispatch import receiver
+from django.template import Context
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
+
+# Name of each email -> path of its templates, without the .txt/.html extension
+EMAIL_TEMPLATES = {
+    "invitation": "templates/emails/invitation",
+    "notify_admins": "templates/emails/notify_admins",
+}
+
+
+@lru_cache(maxsize=None)
+def get_email_templates(name):
+    """Returns the compiled text and HTML templates of an email. Loaded and compiled once per process."""
+    path = EMAIL_TEMPLATES[name]
+    return get_template(f"{path}.txt").template, get_template(f"{path}.html").template
+
+
+@receiver(file_changed, dispatch_uid="reset_email_templates")
+def reset_email_templates(sender, file_path, **kwargs):
+    # runserver reloads the templates that change without restarting, the compiled emails must be reloaded too
+    if file_path.suffix in (".txt", ".html"):
+        get_email_templates.cache_clear()
+
+
+class EmailRenderingService:
+    """Renders the text and HTML bodies of the emails.
+
+    The templates are compiled once per process and both variants are rendered from the same context. The text
+    variant is not HTML-escaped, so the links keep their `&` in the plain text emails.
+    """
+
+    def render(self, name, context):
+        """Returns the text and HTML bodies of the email."""
+        return self.render_many(name, [context])[0]
+
+    def render_many(self, name, contexts):
+        """Returns the text and HTML bodies of the email for each context, e.g. one per recipient of a bulk send."""
+        text_template, html_template = get_email_templates(name)
+        context = Context()
+        bodies = []
+        for values in contexts:
+            with context.push(values):
+                context.autoescape = False
+                text = text_template.render(context)
+                context.autoescape = True
+                bodies.append((text, html_template.render(context)))
+        return bodies
@@ -0,0 +1,138 @@
+import logging
+import string
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.models import Publication, ScholarEnrichment
+from backend.services.lab_statistics_service import LabStatisticsService
+from backend.services.publication_generator_service import PublicationGeneratorService
+
+logger = logging.getLogger(__name__)
+
+# Publication fields that can be filled with the data from Google Scholar
+SCHOLAR_FIELDS = ("title", "author", "journal", "booktitle", "publisher", "year", "volume", "number", "pages", "url")
+
+
+class GoogleScholarBlockedError(Exception):
+    """Raised when Google Scholar refuses too many requests in a row."""
+
+
+class GoogleScholarEnrichmentService:
+    """Completes the publications saved from OpenAlex with the data from Google Scholar.
+
+    The publications to enrich are queued as `ScholarEnrichment` rows, so a run that gets blocked by Google
+    stops and the next one resumes with the publications that are still pending. The delay between two requests
+    grows after each failure and shrinks back after each success.
+    """
+
+    MIN_DELAY = 3
+    MAX_DELAY = 300
+    MAX_ATTEMPTS = 5
+    MAX_CONSECUTIVE_FAILURES = 3
+
+    def __init__(self, use_proxy=True):
+        self.use_proxy = use_proxy
+        self.delay = self.MIN_DELAY
+        self.failures = 0
+        self._scholarly = None
+
+    def enqueue(self, publication_ids):
+        """Adds the publications to the queue, or puts them back in it if they were already enriched."""
+        enrichments = [ScholarEnrichment(publication_id=publication_id) for publication_id in publication_ids]
+        ScholarEnrichment.objects.bulk_create(
+            enrichments,
+            update_conflicts=True,
+            unique_fields=["publication"],
+            update_fields=["status", "attempts", "error"],
+        )
+
+    def run(self, limit=None):
+        """Enriches the pending publications, oldest first. Returns the number of publications enriched."""
+        pending = ScholarEnrichment.objects.filter(status=ScholarEnrichment.STATUS.PENDING).select_related("publication").order_by("queued_at")
+        if limit:
+            pending = pending[:limit]
+
+        enriched = 0
+        consecutive_failures = 0
+        for enrichment in pending:
+            try:
+                if self._enrich(enrichment):
+                    enriched += 1
+                consecutive_failures = 0
+                self.delay = max(self.MIN_DELAY, self.delay / 2)
+            except GoogleScholarBlockedError:
+                self.failures += 1
+                consecutive_failures += 1
+                self.delay = min(self.MAX_DELAY, self.delay * 2)
+                if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                    logger.warning("Blocked by Google Scholar. The remaining publications will be enriched on the next run.")
+                    break
+            time.sleep(self.delay)
+
+        logger.info(f"{enriched} publications enriched with Google Scholar")
+        return enriched
+
+    def _set_up_scholarly(self):
+        """Imports scholarly and activates its proxy. Done once per run.
+
+        scholarly pulls in selenium, httpx and free-proxy, so it is only imported when a publication is enriched.
+        """
+        if self._scholarly is not None:
+            return self._scholarly
+        from scholarly import ProxyGenerator, scholarly
+
+        if self.use_proxy:
+            pg = ProxyGenerator()
+            pg.FreeProxies()
+            scholarly.use_proxy(pg)
+        self._scholarly = scholarly
+        return scholarly
+
+    def _clean_title(self, publication_title):
+        """Remove any illegal characters from the publication's title"""
+        allowed = string.ascii_letters + string.digits + string.punctuation + string.whitespace
+        return "".join(character for character in publication_title if character in allowed).strip()
+
+    def _enrich(self, enrichment):
+        """Fetches one publication from Google Scholar and saves it. Returns False if Google Scholar does not know the publication."""
+        publication = enrichment.publication
+        enrichment.attempts += 1
+        enrichment.last_attempt_at = timezone.now()
+
+        logger.info(f"Getting publication data from Google Scholar for '{publication.title}'...")
+        try:
+            scholarly = self._set_up_scholarly()
+            results = scholarly.search_pubs(self._clean_title(publication.title or ""))
+            filled = scholarly.fill(next(results))
+        except StopIteration:
+            enrichment.status = ScholarEnrichment.STATUS.FAILED
+            enrichment.error = "Publication not found on Google Scholar"
+            enrichment.save(update_fields=["status", "attempts", "last_attempt_at", "error"])
+            return False
+        except Exception as e:
+            logger.error(f"Cannot fetch '{publication.title}' from Google Scholar - {e}")
+            if enrichment.attempts >= self.MAX_ATTEMPTS:
+                enrichment.status = ScholarEnrichment.STATUS.FAILED
+            enrichment.error = str(e)
+            enrichment.save(update_fields=["status", "attempts", "last_attempt_at", "error"])
+            raise GoogleScholarBlockedError() from e
+
+        # Scholarly needs these two fields to be able to generate a bibtex
+        filled["bib"]["ENTRYTYPE"] = "DUMMY"
+        filled["bib"]["ID"] = "DUMMY"
+
+        pub_gen = PublicationGeneratorService()
+        entrytype, citekey, fields = pub_gen.generate_google_scholar_publication(scholarly.bibtex(filled))
+        values = {field: fields[field] for field in SCHOLAR_FIELDS if fields.get(field)}
+
+        with transaction.atomic():
+            # Approved publications may have been corrected by an admin in the meantime
+            if Publication.objects.filter(id=publication.id, is_approved=False).update(entrytype=entrytype, citekey=citekey, **values):
+                # Updated without the signals, the year may have changed
+                LabStatisticsService.schedule(Publication)
+            enrichment.status = ScholarEnrichment.STATUS.DONE
+            enrichment.error = None
+            enrichment.save(update_fields=["status", "attempts", "last_attempt_at", "error"])
+        return True
@@ -0,0 +1,117 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+
+from backend.models import Award, Course, Event, LabStatistic, Member, Publication, ResearchProject
+
+logger = logging.getLogger(__name__)
+
+# Subject -> objects counted (the ones listed by the API) and fields whose values are counted too
+SUBJECTS = {
+    "members": (Member.visible, ["role", "status"]),
+    "publications": (lambda: Publication.objects.filter(duplicate_of__isnull=True), ["year"]),
+    "projects": (ResearchProject.objects.all, []),
+    "awards": (Award.objects.all, ["year"]),
+    "events": (Event.objects.all, ["domain"]),
+    "courses": (Course.objects.all, ["year"]),
+}
+
+# Model -> subjects to refresh when its objects change. A deactivated user hides its member
+MODEL_SUBJECTS = {
+    Member: ["members"],
+    User: ["members"],
+    Publication: ["publications"],
+    ResearchProject: ["projects"],
+    Award: ["awards"],
+    Event: ["events"],
+    Course: ["courses"],
+}
+
+_deferred = threading.local()
+
+
+class LabStatisticsService:
+    """Counts the members, publications, projects, awards, events and courses shown by the home page and the dashboard.
+
+    The counts are saved in the `LabStatistic` table and read with one query. Only the subject of the objects that
+    changed is counted again, after the commit of their transaction.
+    """
+
+    def get(self):
+        """Returns the statistics of each subject: its `total` and the count of each value of its fields."""
+        statistics = list(LabStatistic.objects.all())
+        # e.g. first request after the deployment
+        missing = SUBJECTS.keys() - {statistic.subject for statistic in statistics}
+        if missing:
+            self.refresh(*missing)
+            statistics = list(LabStatistic.objects.all())
+
+        result = {subject: {"total": 0, **{field: {} for field in fields}} for subject, (_, fields) in SUBJECTS.items()}
+        for statistic in statistics:
+            if statistic.subject not in result:
+                continue
+            if statistic.group:
+                result[statistic.subject][statistic.group][statistic.key] = statistic.count
+            else:
+                result[statistic.subject]["total"] = statistic.count
+        result["updated_at"] = max((statistic.updated_at for statistic in statistics), default=None)
+        return result
+
+    def refresh(self, *subjects):
+        """Counts the objects of the subjects again, all of them by default."""
+        for subject in subjects or SUBJECTS:
+            objects, fields = SUBJECTS[subject]
+            statistics = [LabStatistic(subject=subject, count=objects().count())]
+            for field in fields:
+                for row in objects().order_by().values(field).annotate(count=Count("pk")):
+                    key = "" if row[field] is None else str(row[field])
+                    statistics.append(LabStatistic(subject=subject, group=field, key=key, count=row["count"]))
+
+            with transaction.atomic():
+                LabStatistic.objects.bulk_create(
+                    statistics, update_conflicts=True, unique_fields=["subject", "group", "key"], update_fields=["count", "updated_at"]
+                )
+                # The values that are not used anymore (e.g. the last award of a year was deleted)
+                LabStatistic.objects.filter(subject=subject).exclude(pk__in=[statistic.pk for statistic in statistics]).delete()
+        logger.debug(f"Lab statistics refreshed: {', '.join(subjects or SUBJECTS)}")
+
+    @classmethod
+    def schedule(cls, model):
+        """Refreshes the subjects of the model after the commit of the current transaction, or at the end of `deferred()`."""
+        subjects = MODEL_SUBJECTS.get(model, [])
+        pending = getattr(_deferred, "subjects", None)
+        if pending is not None:
+            pending.update(subjects)
+        elif subjects:
+            transaction.on_commit(lambda: cls().refresh(*subjects))
+
+    @classmethod
+    @contextmanager
+    def deferred(cls):
+        """Refreshes the subjects that changed once at the end of the block, e.g. after saving all the publications of
+        the synchronisation one by one."""
+        _deferred.subjects = set()
+        try:
+            yield
+        finally:
+            subjects, _deferred.subjects = _deferred.subjects, None
+            if subjects:
+                cls().refresh(*subjects)
+
+
+def refresh_statistics(sender, instance, **kwargs):
+    # Saving the password or the last login of a user does not change the members shown
+    update_fields = kwargs.get("update_fields")
+    if sender is User and update_fields is not None and "is_active" not in update_fields:
+        return
+    LabStatisticsService.schedule(sender)
+
+
+for model in MODEL_SUBJECTS:
+    post_save.connect(refresh_statistics, sender=model, dispatch_uid=f"refresh_statistics_save_{model.__name__}")
+    post_delete.connect(refresh_statistics, sender=model, dispatch_uid=f"refresh_statistics_delete_{model.__name__}")
@@ -0,0 +1,236 @@
+import csv
+import json
+import logging
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.db import transaction
+
+from backend.models import Award, AwardRecipient, Course, Member
+from backend.services.lab_statistics_service import LabStatisticsService
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(path):
+    """Yields the rows of a CSV, JSON Lines or JSON file as dictionaries.
+
+    CSV and JSON Lines files are streamed row by row. A JSON file holds a single array and is loaded at once, so
+    large exports should use one of the other two formats.
+    """
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as file:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(file)
+        elif path.suffix == ".jsonl":
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        elif path.suffix == ".json":
+            yield from json.load(file)
+        else:
+            raise ValueError(f"Unsupported legacy data file '{path}': expected a .csv, .json or .jsonl file")
+
+
+def too_long(model, **values):
+    """Returns the first of the values that is longer than its column.
+
+    The bulk inserts cast the values to the type of the columns, which silently truncates the strings in PostgreSQL.
+    """
+    for name, value in values.items():
+        max_length = model._meta.get_field(name).max_length
+        if value and max_length and len(value) > max_length:
+            return name
+    return None
+
+
+def assign(instance, fields):
+    """Sets the fields of the instance and returns whether any of them changed."""
+    changed = False
+    for attr, value in fields.items():
+        if getattr(instance, attr) != value:
+            setattr(instance, attr, value)
+            changed = True
+    return changed
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def split_name(name):
+    """Returns the `(first name, last name)` of a "First, Last" name."""
+    first_name, _, last_name = name.partition(",")
+    return first_name.strip(), last_name.strip()
+
+
+class LegacyImportService:
+    """Imports the members, awards and courses of the former website.
+
+    The rows are read from the files in batches and every batch is saved with one `bulk_create` and one
+    `bulk_update` per model, in a single transaction: either all the files are imported, or nothing is. The
+    existing rows are matched on their natural key (name of the member, title of the award, title, year and
+    semester of the course) with maps loaded once at the start, so running the import again only updates the rows
+    whose values changed instead of duplicating them.
+    """
+
+    BATCH_SIZE = 1000
+
+    MEMBER_FIELDS = ["role", "status", "email", "biography"]
+    AWARD_FIELDS = ["url", "year", "organization"]
+    COURSE_FIELDS = ["url", "teacher", "code", "level", "description"]
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.stats = {}
+        self._members = {}
+
+    def run(self, members=None, awards=None, courses=None):
+        """Imports the given files and returns the number of rows created, updated and skipped for each model."""
+        with transaction.atomic():
+            self._members = {(m.first_name, m.last_name): m for m in Member.objects.only("id", "first_name", "last_name", *self.MEMBER_FIELDS)}
+            if members:
+                self._timed("members", self.import_members, read_rows(members))
+                LabStatisticsService.schedule(Member)
+            if awards:
+                self._timed("awards", self.import_awards, read_rows(awards))
+                LabStatisticsService.schedule(Award)
+            if courses:
+                self._timed("courses", self.import_courses, read_rows(courses))
+                LabStatisticsService.schedule(Course)
+        return self.stats
+
+    def import_members(self, rows):
+        for batch in batched(rows, self.batch_size):
+            new, changed = [], {}
+            for row in batch:
+                key = (row["first_name"].strip(), row["last_name"].strip())
+                if field := too_long(Member, first_name=key[0], last_name=key[1]):
+                    logger.warning(f"The {field} of the member '{key[0]} {key[1]}' is too long, member skipped")
+                    self._count("members", skipped=1)
+                    continue
+                fields = {
+                    "role": row.get("role") or None,
+                    "status": row.get("status") or None,
+                    "email": row.get("email") or None,
+                    "biography": row.get("biography") or None,
+                }
+                member = self._members.get(key)
+                if member is None:
+                    member = Member(first_name=key[0], last_name=key[1], **fields)
+                    self._members[key] = member
+                    new.append(member)
+                    continue
+                if assign(member, fields) and not member._state.adding:
+                    changed[member.pk] = member
+
+            Member.objects.bulk_create(new)
+            Member.objects.bulk_update(changed.values(), self.MEMBER_FIELDS)
+            self._count("members", created=len(new), updated=len(changed))
+
+    def import_awards(self, rows):
+        awards_by_title = {award.title: award for award in Award.objects.only("id", "title", *self.AWARD_FIELDS)}
+        for batch in batched(rows, self.batch_size):
+            new, changed, recipients = [], {}, []
+            for row in batch:
+                if field := too_long(Award, title=row["title"]):
+                    logger.warning(f"The {field} of the award '{row['title']}' is too long, award skipped")
+                    self._count("awards", skipped=1)
+                    continue
+                fields = {
+                    "url": row.get("url") or None,
+                    "year": int(row["year"]) if row.get("year") else None,
+                    "organization": row.get("organization") or None,
+                }
+                award = awards_by_title.get(row["title"])
+                if award is None:
+                    award = Award(title=row["title"], **fields)
+                    awards_by_title[award.title] = award
+                    new.append(award)
+                elif assign(award, fields) and not award._state.adding:
+                    changed[award.pk] = award
+
+                names = row.get("award_recipients") or []
+                # In CSV files, the recipients are in one column, separated with semicolons
+                if isinstance(names, str):
+                    names = [name for name in names.split(";") if name.strip()]
+                for name in names:
+                    member = self._members.get(split_name(name))
+                    if member is None:
+                        logger.warning(f"Recipient '{name.strip()}' of the award '{award.title}' is not a member, skipped")
+                        self._count("award recipients", skipped=1)
+                        continue
+                    recipients.append((award, member))
+
+            Award.objects.bulk_create(new)
+            Award.objects.bulk_update(changed.values(), self.AWARD_FIELDS)
+            self._count("awards", created=len(new), updated=len(changed))
+            self._add_recipients(recipients)
+
+    def import_courses(self, rows):
+        courses_by_key = {(c.title, c.year, c.semester): c for c in Course.objects.only("id", "title", "year", "semester", *self.COURSE_FIELDS)}
+        for batch in batched(rows, self.batch_size):
+            new, changed = [], {}
+            for row in batch:
+                if field := too_long(Course, title=row["title"], code=row["code"]):
+                    logger.warning(f"The {field} of the course '{row['title']}' is too long, course skipped")
+                    self._count("courses", skipped=1)
+                    continue
+                teacher = self._members.get(split_name(row["teacher"]))
+                if teacher is None:
+                    logger.warning(f"Teacher '{row['teacher'].strip()}' of the course '{row['title']}' is not a member, course skipped")
+                    self._count("courses", skipped=1)
+                    continue
+
+                key = (row["title"], int(row["year"]) if row.get("year") else None, row.get("semester") or None)
+                fields = {
+                    "url": row.get("url") or None,
+                    "teacher_id": teacher.pk,
+                    "code": row["code"],
+                    "level": row.get("level") or None,
+                    "description": row.get("description") or None,
+                }
+                course = courses_by_key.get(key)
+                if course is None:
+                    course = Course(title=key[0], year=key[1], semester=key[2], **fields)
+                    courses_by_key[key] = course
+                    new.append(course)
+                    continue
+                if assign(course, fields) and not course._state.adding:
+                    changed[course.pk] = course
+
+            Course.objects.bulk_create(new)
+            Course.objects.bulk_update(changed.values(), self.COURSE_FIELDS)
+            self._count("courses", created=len(new), updated=len(changed))
+
+    def _add_recipients(self, recipients):
+        """Creates the recipients that the awards do not have yet. The current recipients are never removed."""
+        if not recipients:
+            return
+        existing = set(AwardRecipient.objects.filter(award__in={award.pk for award, _ in recipients}).values_list("award_id", "member_id"))
+        new = {}
+        for award, member in recipients:
+            if (award.pk, member.pk) not in existing:
+                new[(award.pk, member.pk)] = AwardRecipient(award=award, member=member)
+        AwardRecipient.objects.bulk_create(new.values())
+        self._count("award recipients", created=len(new))
+
+    def _timed(self, name, method, rows):
+        start = time.perf_counter()
+        method(rows)
+        stats = self._count(name)
+        stats["seconds"] = time.perf_counter() - start
+        logger.info(
+            f"Legacy {name} imported: {stats['created']} created, {stats['updated']} updated, {stats['skipped']} skipped in {stats['seconds']:.2f}s",
+            extra={"event": "legacy_import", "model": name, "stats": dict(stats)},
+        )
+
+    def _count(self, name, created=0, updated=0, skipped=0):
+        stats = self.stats.setdefault(name, {"created": 0, "updated": 0, "skipped": 0})
+        stats["created"] += created
+        stats["updated"] += updated
+        stats["skipped"] += skipped
+        return stats
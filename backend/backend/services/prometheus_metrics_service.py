@@ -0,0 +1,182 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+# Buckets (in seconds) of the latency histograms, close to the default buckets of the Prometheus clients
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, one value per combination of labels.
+
+    With a `source`, the values are not counted by this process but returned by `source()` on each scrape, as a
+    dict of label values -> value (e.g. counted in the database, so that they are the same in every process).
+    """
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), source=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.source = source
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def collect(self):
+        if self.source:
+            values = {tuple(str(value) for value in key): value for key, value in self.source().items()}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, one series per combination of labels.
+
+    With a `source`, `source(buckets)` returns on each scrape a dict of label values -> (number of values in each
+    bucket, the last one being +Inf, and sum of the values), instead of the values observed by this process.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, source=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.source = source
+        self._counts = {}
+        self._sums = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        # Index of the first bucket the value fits in; the last slot is the +Inf bucket
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, **labels):
+        return sum(self._counts.get(tuple(str(labels[name]) for name in self.labelnames), []))
+
+    def collect(self):
+        if self.source:
+            series = {tuple(str(value) for value in key): value for key, value in self.source(self.buckets).items()}
+            counts = {key: list(value[0]) for key, value in series.items()}
+            sums = {key: value[1] for key, value in series.items()}
+        else:
+            with self._lock:
+                counts = {key: list(value) for key, value in self._counts.items()}
+                sums = dict(self._sums)
+
+        lines = []
+        for key in sorted(counts):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[key]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(sums[key])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process registry rendered in the Prometheus text exposition format (version 0.0.4).
+
+    Each worker process has its own registry, so with several workers every scrape only sees the worker that
+    answered it. Scrape each worker, or aggregate with the `instance` label.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), source=None):
+        return self.register(Counter(name, documentation, labelnames, source))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, source=None):
+        return self.register(Histogram(name, documentation, labelnames, buckets, source))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests handled, by view, method and status code.", ("view", "method", "status"))
+HTTP_REQUEST_DURATION = REGISTRY.histogram("http_request_duration_seconds", "Time spent handling the HTTP requests, by view.", ("view", "method"))
+DB_QUERIES = REGISTRY.histogram("db_queries_per_request", "Database queries executed per HTTP request, by view.", ("view",), QUERY_COUNT_BUCKETS)
+DB_QUERY_DURATION = REGISTRY.histogram("db_query_duration_seconds_per_request", "Time spent in the database per HTTP request, by view.", ("view",))
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Lookups in the application caches, by cache and result (hit or miss).", ("cache", "result")
+)
+SYNC_DURATION = REGISTRY.histogram(
+    "publication_sync_duration_seconds", "Duration of the publication synchronisations.", (), (10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+
+
+# The emails are sent by the `sendemails` worker, which is not scraped: these metrics are counted in the outbox by
+# the process answering the scrape
+def _email_counts():
+    from backend.services.email_outbox_service import EmailOutboxService
+
+    return EmailOutboxService.count_emails()
+
+
+def _email_delivery_durations(buckets):
+    from backend.services.email_outbox_service import EmailOutboxService
+
+    return EmailOutboxService.delivery_durations(buckets)
+
+
+EMAILS = REGISTRY.counter(
+    "emails_total", "Emails processed by the outbox worker, by kind and result (sent, retried or failed).", ("kind", "result"), source=_email_counts
+)
+EMAIL_DELIVERY_DURATION = REGISTRY.histogram(
+    "email_delivery_duration_seconds",
+    "Time between the queuing and the sending of the emails, by kind of email.",
+    ("kind",),
+    (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+    source=_email_delivery_durations,
+)
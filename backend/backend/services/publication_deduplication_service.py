@@ -0,0 +1,193 @@
+import hashlib
+import random
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import transaction
+
+from backend.models import Publication
+from backend.services.lab_statistics_service import LabStatisticsService
+
+
+class PublicationDeduplicationService:
+    """Finds publications that describe the same paper (preprint, conference and journal versions, ...).
+
+    Candidates are found with MinHash signatures of the normalized titles bucketed with LSH bands, so the
+    publications are never compared two by two. Every candidate pair is then confirmed with the DOI, the
+    title similarity and the overlap between the authors.
+    """
+
+    SHINGLE_SIZE = 4
+    NUM_PERMUTATIONS = 64
+    NUM_BANDS = 16
+    TITLE_THRESHOLD = 0.8
+    AUTHOR_THRESHOLD = 0.5
+
+    # Mersenne prime used by the universal hash family of the MinHash permutations
+    _PRIME = (1 << 61) - 1
+
+    # Where preprints and data dumps are usually hosted. These are never preferred as the canonical record.
+    PREPRINT_HOSTS = ("arxiv", "zenodo", "researchgate", "biorxiv", "ssrn", "hal.science")
+
+    ENTRYTYPE_RANK = {"article": 0, "inproceedings": 1, "incollection": 2, "inbook": 3, "book": 4, "phdthesis": 5, "techreport": 6}
+
+    def __init__(self):
+        # Seeded so the signatures, and therefore the clusters, are the same from one run to the other
+        rng = random.Random(42)
+        self._permutations = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(self.NUM_PERMUTATIONS)]
+
+    def run(self):
+        """Clusters the duplicated publications and links every duplicate to its canonical publication.
+
+        Returns the number of publications that are marked as duplicates.
+        """
+        publications = list(
+            Publication.objects.only(
+                "id", "title", "author", "doi", "journal", "booktitle", "url", "entrytype", "year", "is_approved", "duplicate_of_id", "dedup_ignored"
+            )
+        )
+        clusters = self.find_clusters(publications)
+
+        canonical_by_id = {}
+        for cluster in clusters:
+            canonical = self.choose_canonical(cluster)
+            for publication in cluster:
+                if publication.id != canonical.id:
+                    canonical_by_id[publication.id] = canonical.id
+
+        to_update = []
+        for publication in publications:
+            duplicate_of_id = canonical_by_id.get(publication.id)
+            if publication.duplicate_of_id != duplicate_of_id:
+                publication.duplicate_of_id = duplicate_of_id
+                to_update.append(publication)
+
+        with transaction.atomic():
+            Publication.objects.bulk_update(to_update, ["duplicate_of"], batch_size=500)
+            if to_update:
+                # The duplicates are not counted in the statistics
+                LabStatisticsService.schedule(Publication)
+
+        return len(canonical_by_id)
+
+    def find_clusters(self, publications):
+        """Groups the publications that are duplicates of each other. Only groups of two or more are returned."""
+        publications = [p for p in publications if not p.dedup_ignored]
+        parents = list(range(len(publications)))
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        def union(i, j):
+            parents[find(i)] = find(j)
+
+        shingles = [self._shingles(p.title) for p in publications]
+        authors = [self._author_keys(p.author) for p in publications]
+
+        candidates = set()
+
+        # Publications with the same DOI are always the same paper
+        by_doi = defaultdict(list)
+        for i, publication in enumerate(publications):
+            doi = self.normalize_doi(publication.doi)
+            if doi:
+                by_doi[doi].append(i)
+        for indexes in by_doi.values():
+            for i in indexes[1:]:
+                union(indexes[0], i)
+
+        # Publications sharing at least one LSH band have similar titles
+        rows = self.NUM_PERMUTATIONS // self.NUM_BANDS
+        buckets = defaultdict(list)
+        for i, title_shingles in enumerate(shingles):
+            if not title_shingles:
+                continue
+            signature = self._minhash(title_shingles)
+            for band in range(self.NUM_BANDS):
+                buckets[(band, tuple(signature[band * rows : (band + 1) * rows]))].append(i)
+        for bucket in buckets.values():
+            for position, i in enumerate(bucket):
+                for j in bucket[position + 1 :]:
+                    candidates.add((i, j))
+
+        for i, j in candidates:
+            if find(i) == find(j):
+                continue
+            if self._jaccard(shingles[i], shingles[j]) < self.TITLE_THRESHOLD:
+                continue
+            # Only compare authors when both publications have some, as Google Scholar sometimes omits them
+            if authors[i] and authors[j] and self._overlap(authors[i], authors[j]) < self.AUTHOR_THRESHOLD:
+                continue
+            union(i, j)
+
+        clusters = defaultdict(list)
+        for i, publication in enumerate(publications):
+            clusters[find(i)].append(publication)
+
+        return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+    def choose_canonical(self, cluster):
+        """Picks the publication to keep: approved first, then the published version over the preprints, then the most complete."""
+
+        def sort_key(publication):
+            url = (publication.url or "").lower()
+            venue = f"{publication.journal or ''} {publication.booktitle or ''}".lower()
+            is_preprint = any(host in url or host in venue for host in self.PREPRINT_HOSTS)
+            completeness = sum(1 for field in ("doi", "journal", "booktitle", "url", "year", "author") if getattr(publication, field))
+            return (
+                not publication.is_approved,
+                is_preprint,
+                self.ENTRYTYPE_RANK.get(publication.entrytype, len(self.ENTRYTYPE_RANK)),
+                -completeness,
+                -(publication.year or 0),
+                publication.id,
+            )
+
+        return min(cluster, key=sort_key)
+
+    @staticmethod
+    def normalize_doi(doi):
+        """Lowercases the DOI and strips the resolver prefix (https://doi.org/...)."""
+        if not doi:
+            return ""
+        return re.sub(r"^(https?://)?(dx\.)?doi\.org/", "", doi.strip().lower())
+
+    @staticmethod
+    def normalize_title(title):
+        """Lowercases the title and removes the accents, the punctuation and the extra whitespace."""
+        if not title:
+            return ""
+        title = unicodedata.normalize("NFKD", title)
+        title = "".join(character for character in title if not unicodedata.combining(character))
+        title = re.sub(r"[^\w\s]", " ", title.lower())
+        return " ".join(title.split())
+
+    def _shingles(self, title):
+        normalized = self.normalize_title(title)
+        if len(normalized) <= self.SHINGLE_SIZE:
+            return {normalized} if normalized else set()
+        return {normalized[i : i + self.SHINGLE_SIZE] for i in range(len(normalized) - self.SHINGLE_SIZE + 1)}
+
+    def _minhash(self, shingles):
+        hashed = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+        return [min((a * h + b) % self._PRIME for h in hashed) for a, b in self._permutations]
+
+    def _author_keys(self, authors):
+        """Last names of the authors. Authors are stored as 'Lastname, Firstname and Lastname, Firstname'."""
+        if not authors:
+            return set()
+        return {self.normalize_title(author.split(",")[0]) for author in authors.split(" and ") if author.strip()}
+
+    @staticmethod
+    def _jaccard(a, b):
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+    @staticmethod
+    def _overlap(a, b):
+        return len(a & b) / min(len(a), len(b))
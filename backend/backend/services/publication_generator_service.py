@@ -86,6 +86,9 @@ class PublicationGeneratorService:
         volume = biblio.get("volume", "")
         number = biblio.get("issue", "")
 
+        # OpenAlex gives the DOI as a link (https://doi.org/10.xxx), only the identifier is kept
+        doi = (data.get("doi") or "").replace("https://doi.org/", "")
+
         fields = {
             "author": authors,
             "title": title,
@@ -97,6 +100,7 @@ class PublicationGeneratorService:
             "number": number,
             "pages": page_range,
             "url": url,
+            "doi": doi,
         }
 
         # Filter out empty or None fields before returning
@@ -0,0 +1,70 @@
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class SyncMetricsService:
+    """Collects the time spent in each stage of the publication sync and a few counters.
+
+    Every stage and counter is emitted as a structured log record (the `extra` fields end up as JSON keys with
+    the `json` formatter of the file handler) and summarized in a report table at the end of the run.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.max_durations = defaultdict(float)
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name):
+        """Times the enclosed block and adds it to the stage's total."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.durations[name] += elapsed
+            self.calls[name] += 1
+            self.max_durations[name] = max(self.max_durations[name], elapsed)
+
+    def increment(self, counter, value=1):
+        self.counters[counter] += value
+
+    def emit(self):
+        """Logs one structured event per stage and one for the whole run."""
+        for name in self.durations:
+            logger.info(
+                f"Stage '{name}' took {self.durations[name]:.3f}s",
+                extra={
+                    "event": "sync_stage",
+                    "stage": name,
+                    "calls": self.calls[name],
+                    "total_ms": round(self.durations[name] * 1000, 1),
+                    "max_ms": round(self.max_durations[name] * 1000, 1),
+                },
+            )
+        logger.info(
+            f"Sync finished in {self.elapsed():.3f}s",
+            extra={"event": "sync_summary", "total_ms": round(self.elapsed() * 1000, 1), **self.counters},
+        )
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def report(self):
+        """Report table of the stages, slowest first, followed by the counters."""
+        total = self.elapsed() or 1
+        lines = [f"{'Stage':<16}{'Calls':>8}{'Total (s)':>12}{'Max (ms)':>12}{'% of run':>10}"]
+        for name in sorted(self.durations, key=self.durations.get, reverse=True):
+            duration = self.durations[name]
+            lines.append(f"{name:<16}{self.calls[name]:>8}{duration:>12.3f}{self.max_durations[name] * 1000:>12.1f}{duration / total * 100:>9.1f}%")
+        lines.append(f"{'total':<16}{'':>8}{self.elapsed():>12.3f}")
+        lines.append("")
+        for counter in sorted(self.counters):
+            lines.append(f"{counter:<16}{self.counters[counter]:>8}")
+        return "\n".join(lines)
@@ -2,9 +2,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
+from backend.hashers import get_password_hashers
+
 pytestmark = pytest.mark.django_db
 
 client = APIClient()
@@ -126,3 +130,52 @@ def test_login_invalid_credentials(mock_user_filter, mock_authenticate, login_ur
     response = client.post(login_url, data, format="json")
     assert response.status_code == 400
     assert "non_field_errors" in response.data or "detail" in response.data
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create_user(username="dev", email="Dev@Example.com", password="StrongPass123"),
+        User.objects.create_user(username="dev@example.com", email="other@example.com", password="OtherPass123"),
+    ]
+
+
+def test_login_looks_up_the_user_with_one_query(users, login_url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(login_url, {"username_or_email": "dev@EXAMPLE.com", "password": "StrongPass123"}, format="json")
+
+    assert response.status_code == 200
+    # The email wins over the username of another user
+    assert response.data["user"]["username"] == "dev"
+    assert len(queries) == 1
+
+
+def test_login_by_username_and_wrong_password(users, login_url):
+    response = client.post(login_url, {"username_or_email": "dev", "password": "StrongPass123"}, format="json")
+    assert response.data["user"]["email"] == "Dev@example.com"
+
+    response = client.post(login_url, {"username_or_email": "dev", "password": "OtherPass123"}, format="json")
+    assert response.status_code == 400
+    assert response.data["non_field_errors"] == ["Invalid username/email or password."]
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+def test_login_rehashes_the_password_when_the_iterations_change(login_url):
+    User.objects.create_user(username="dev", password="StrongPass123")
+
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+        response = client.post(login_url, {"username_or_email": "dev", "password": "StrongPass123"}, format="json")
+
+    assert response.status_code == 200
+    assert User.objects.get().password.startswith("pbkdf2_sha256$2000$")
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000, PASSWORD_SCRYPT_WORK_FACTOR=2**10)
+def test_login_rehashes_the_password_with_the_new_policy(login_url):
+    User.objects.create_user(username="dev", password="StrongPass123")
+
+    with override_settings(PASSWORD_HASHERS=get_password_hashers("scrypt")):
+        response = client.post(login_url, {"username_or_email": "dev", "password": "StrongPass123"}, format="json")
+        assert response.status_code == 200
+        assert User.objects.get().password.startswith("scrypt$1024$")
+        assert User.objects.get().check_password("StrongPass123")
@@ -0,0 +1,133 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.authentication import user_cache
+from backend.models import Award, AwardRecipient, Course, Member, Publication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(user=User(username="admin", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def members():
+    return Member.objects.bulk_create([Member(first_name=f"First{i}", last_name=f"Last{i}", role="PHD") for i in range(3)])
+
+
+def test_bulk_requires_admin(members):
+    response = APIClient().post(reverse("courses-bulk"), [{"title": "Course"}], format="json")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_bulk_create_courses(client, members):
+    data = [{"title": f"Course {i}", "code": f"LOG{i}", "teacher_id": str(members[0].id)} for i in range(20)]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(reverse("courses-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [item["status"] for item in response.data] == ["created"] * 20
+    assert response.data[0]["data"]["teacher"]["id"] == str(members[0].id)
+    assert Course.objects.count() == 20
+    # The teacher of each item is still validated, but the courses are inserted in one query
+    assert len([query for query in queries if query["sql"].startswith("INSERT")]) == 1
+
+
+def test_bulk_create_is_all_or_nothing(client, members):
+    data = [{"title": "Valid", "code": "LOG1", "teacher_id": str(members[0].id)}, {"title": "Missing code"}]
+
+    response = client.post(reverse("courses-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data[0] == {"status": "skipped"}
+    assert response.data[1]["status"] == "error"
+    assert "code" in response.data[1]["errors"]
+    assert not Course.objects.exists()
+
+
+def test_bulk_create_awards_with_recipients(client, members):
+    data = [{"title": f"Award {i}", "organization": "ICSE", "recipients": [{"id": str(m.id)} for m in members[:2]]} for i in range(3)]
+
+    response = client.post(reverse("awards-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert AwardRecipient.objects.count() == 6
+    assert len(response.data[0]["data"]["recipients"]) == 2
+
+
+def test_bulk_update_publications(client):
+    Publication.objects.bulk_create([Publication(id=f"W{i}", entrytype="article", citekey=f"key{i}", title=f"Title {i}") for i in range(5)])
+
+    response = client.put(reverse("publication-bulk"), [{"id": f"W{i}", "is_approved": True} for i in range(3)], format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data] == ["W0", "W1", "W2"]
+    assert Publication.objects.filter(is_approved=True).count() == 3
+    assert Publication.objects.get(id="W0").title == "Title 0"
+
+
+def test_bulk_update_keeps_recipients_when_omitted(client, members):
+    award = Award.objects.create(title="Award", organization="ICSE")
+    AwardRecipient.objects.create(award=award, member=members[0])
+
+    response = client.put(reverse("awards-bulk"), [{"id": str(award.id), "year": 2024}], format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert Award.objects.get(id=award.id).year == 2024
+    assert AwardRecipient.objects.filter(award=award).count() == 1
+
+
+def test_bulk_update_awards_only_changes_modified_recipients(client, members):
+    awards = Award.objects.bulk_create([Award(title=f"Award {i}", organization="ICSE") for i in range(2)])
+    AwardRecipient.objects.bulk_create([AwardRecipient(award=award, member=member) for award in awards for member in members[:2]])
+    kept = AwardRecipient.objects.get(award=awards[0], member=members[0]).id
+    data = [{"id": str(award.id), "recipients": [{"id": str(members[0].id)}, {"id": str(members[2].id)}]} for award in awards]
+
+    response = client.put(reverse("awards-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(AwardRecipient.objects.values_list("award_id", "member_id")) == {(a.id, m.id) for a in awards for m in (members[0], members[2])}
+    assert AwardRecipient.objects.get(award=awards[0], member=members[0]).id == kept
+
+
+def test_bulk_update_reports_unknown_ids(client, members):
+    data = [{"id": str(members[0].id), "first_name": "New"}, {"id": "not-a-uuid"}, {"first_name": "No id"}]
+
+    response = client.put(reverse("member-bulk"), data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert [item["status"] for item in response.data] == ["skipped", "error", "error"]
+    assert Member.objects.get(id=members[0].id).first_name == "First0"
+
+
+def test_bulk_delete_members_deactivates_accounts(client, members, django_capture_on_commit_callbacks):
+    user = User.objects.create_user(username="member", password="password")
+    Member.objects.filter(id=members[0].id).update(user=user)
+    user_cache.set(str(user.id), user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.delete(reverse("member-bulk"), [{"id": str(m.id)} for m in members], format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["status"] for item in response.data] == ["deactivated", "deleted", "deleted"]
+    assert Member.objects.count() == 1
+    assert not User.objects.get(id=user.id).is_active
+    # The tokens of the user are refused right away
+    assert user_cache.get(str(user.id)) is None
+
+
+def test_bulk_rejects_non_list_body(client):
+    response = client.post(reverse("events-bulk"), {"title": "Event"}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
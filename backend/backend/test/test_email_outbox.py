@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail import get_connection
+from django.db import connection
+from django.template.loader import get_template
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Invitation, OutboxEmail
+from backend.services.email_outbox_service import EmailOutboxService
+from backend.services.email_rendering_service import EmailRenderingService, get_email_templates
+
+pytestmark = pytest.mark.django_db
+client = APIClient()
+
+
+def test_invitation_is_sent_by_the_worker():
+    response = client.post("/api/send-mail-invitation", {"email": "new@example.com"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"success": True}
+    assert Invitation.objects.filter(email="new@example.com").exists()
+    # Nothing is sent during the request
+    assert mail.outbox == []
+
+    assert EmailOutboxService().run() == 1
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["new@example.com"]
+    assert mail.outbox[0].alternatives[0][1] == "text/html"
+    outbox_email = OutboxEmail.objects.get()
+    assert (outbox_email.status, outbox_email.attempts) == (OutboxEmail.STATUS.SENT, 1)
+
+
+def test_run_sends_all_the_emails_over_one_connection():
+    service = EmailOutboxService()
+    for i in range(3):
+        service.enqueue("invitation", "Subject", [f"user{i}@example.com"], "Body")
+
+    with patch("backend.services.email_outbox_service.get_connection", wraps=get_connection) as mock_get_connection:
+        assert service.run() == 3
+
+    mock_get_connection.assert_called_once()
+    assert sorted(message.to[0] for message in mail.outbox) == ["user0@example.com", "user1@example.com", "user2@example.com"]
+
+
+def test_failed_email_is_retried_later():
+    connection = MagicMock()
+    connection.send_messages.side_effect = ConnectionRefusedError("SMTP server down")
+    email = EmailOutboxService().enqueue("invitation", "Subject", ["user@example.com"], "Body")
+
+    assert EmailOutboxService(connection=connection).run() == 0
+
+    email.refresh_from_db()
+    assert (email.status, email.attempts, email.error) == (OutboxEmail.STATUS.PENDING, 1, "SMTP server down")
+    assert email.next_attempt_at > timezone.now()
+    # Not due yet
+    assert EmailOutboxService().run() == 0
+    assert mail.outbox == []
+
+    OutboxEmail.objects.update(next_attempt_at=timezone.now())
+    assert EmailOutboxService().run() == 1
+    email.refresh_from_db()
+    assert (email.status, email.attempts, email.error) == (OutboxEmail.STATUS.SENT, 2, None)
+
+
+def test_email_fails_after_the_last_attempt():
+    connection = MagicMock()
+    connection.send_messages.side_effect = ConnectionRefusedError("SMTP server down")
+    email = EmailOutboxService().enqueue("invitation", "Subject", ["user@example.com"], "Body")
+    OutboxEmail.objects.update(attempts=EmailOutboxService.MAX_ATTEMPTS - 1)
+
+    EmailOutboxService(connection=connection).run()
+
+    email.refresh_from_db()
+    assert email.status == OutboxEmail.STATUS.FAILED
+
+
+@override_settings(METRICS_TOKEN="secret")
+def test_email_metrics_are_counted_in_the_outbox():
+    service = EmailOutboxService()
+    service.enqueue("invitation", "Subject", ["user1@example.com"], "Body")
+    service.enqueue("invitation", "Subject", ["user2@example.com"], "Body")
+    service.run()
+    failing_connection = MagicMock()
+    failing_connection.send_messages.side_effect = ConnectionRefusedError("SMTP server down")
+    service.enqueue("admin_notification", "Subject", ["admin@example.com"], "Body")
+    EmailOutboxService(connection=failing_connection).run()
+
+    # Scraped from the web process, not from the worker that sent the emails
+    content = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+
+    assert 'emails_total{kind="invitation",result="sent"} 2' in content
+    assert 'emails_total{kind="admin_notification",result="retried"} 1' in content
+    assert 'email_delivery_duration_seconds_bucket{kind="invitation",le="1.0"} 2' in content
+    assert 'email_delivery_duration_seconds_count{kind="invitation"} 2' in content
+
+
+def test_bulk_invitations_report_the_status_of_each_address():
+    Invitation.objects.create(email="pending@example.com", role="user", token="pending", expires_at=timezone.now() + timezone.timedelta(days=1))
+    Invitation.objects.create(email="expired@example.com", role="user", token="expired", expires_at=timezone.now() - timezone.timedelta(days=1))
+    admin_client = APIClient()
+    admin_client.force_authenticate(user=User(username="admin", is_staff=True))
+    emails = ["new@example.com", "Pending@example.com", "expired@example.com", "NEW@example.com", "not-an-email"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post("/api/send-bulk-invitations", {"emails": emails, "role": "postdoc"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["status"] for result in response.data] == ["invited", "already_invited", "invited", "duplicate", "invalid"]
+    assert Invitation.objects.filter(role="postdoc").count() == 2
+    assert OutboxEmail.objects.count() == 2
+    # The pending invitations are looked up once, then the invitations and the emails are inserted in bulk
+    assert len([query for query in queries if query["sql"].startswith("INSERT")]) == 2
+
+    assert EmailOutboxService().run() == 2
+    assert sorted(message.to[0] for message in mail.outbox) == ["expired@example.com", "new@example.com"]
+
+
+def test_bulk_invitations_require_an_admin():
+    response = client.post("/api/send-bulk-invitations", {"emails": ["new@example.com"]}, format="json")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert not Invitation.objects.exists()
+
+
+def test_email_templates_are_compiled_once():
+    get_email_templates.cache_clear()
+    contexts = [{"register_url": f"https://example.com/register?token={i}&email=user{i}@example.com"} for i in range(3)]
+
+    with patch("backend.services.email_rendering_service.get_template", wraps=get_template) as mock_get_template:
+        bodies = EmailRenderingService().render_many("invitation", contexts)
+        EmailRenderingService().render("invitation", contexts[0])
+
+    assert mock_get_template.call_count == 2
+    text, html = bodies[2]
+    # Only the HTML variant is escaped
+    assert "https://example.com/register?token=2&email=user2@example.com" in text
+    assert 'href="https://example.com/register?token=2&amp;email=user2@example.com"' in html
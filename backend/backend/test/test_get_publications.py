@@ -2,26 +2,11 @@ import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.contrib import admin
 
+from backend.admin.publication_admin import PublicationAdmin
 from backend.management.commands.getpublications import Command
-
-
-@pytest.mark.parametrize(
-    "input_title,expected_output",
-    [
-        ("Valid Title 123", "Valid Title 123"),  # nothing to clean
-        ("Title!@#$%^&*()_+", "Title!@#$%^&*()_+"),  # all valid punctuation
-        ("含有中文的标题", ""),  # non-ASCII characters removed
-        ("Title🚀WithEmoji", "TitleWithEmoji"),  # emojis removed
-        ("  Clean Me Up!  ", "Clean Me Up!"),  # trims outer whitespace
-        ("\tTab\nNewline Title", "Tab\nNewline Title"),  # keeps whitespace
-        ("", ""),  # empty string
-        ("     ", ""),  # only spaces
-    ],
-)
-def test_clean_title(input_title, expected_output):
-    command = Command()
-    assert command._clean_title(input_title) == expected_output
+from backend.models import MergedPublication, Publication, PublicationSync, PublicationSyncAuthor
 
 
 @pytest.mark.django_db
@@ -102,3 +87,205 @@ def test_get_all_openalex_publications(
         result = command.get_all_openalex_publications(author_name)
         assert result == expected_publications
         assert len(result) == len(expected_publications)
+
+
+OPENALEX_WORK = {
+    "id": "https://openalex.org/W123",
+    "title": "Something for Something",
+    "authorships": [{"author": {"display_name": "John Doe"}}],
+    "primary_location": {"landing_page_url": "https://example.com", "source": {"display_name": "The Journal", "publisher": "The Publisher"}},
+    "type": "journal-article",
+    "publication_year": 2023,
+}
+
+
+def openalex_pages(*works):
+    """Fakes `iter_openalex_pages` returning a single page of works."""
+    return lambda author_name, cursor="*": iter([(list(works), None)])
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(OPENALEX_WORK))
+@patch.object(Command, "_get_lab_members", return_value=["John Doe"])
+def test_handle_skips_unchanged_publications(mock_members, mock_openalex, mock_notify, mock_dedup):
+    Command().handle(fast=True, restart=False)
+
+    publication = Publication.objects.get(id=OPENALEX_WORK["id"])
+    assert publication.content_hash
+    mock_notify.assert_called_once()
+
+    mock_notify.reset_mock()
+    with patch("backend.management.commands.getpublications.Publication.objects.update_or_create") as mock_update:
+        Command().handle(fast=True, restart=False)
+        mock_update.assert_not_called()
+    mock_notify.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "_get_lab_members", return_value=["John Doe"])
+def test_handle_reports_changed_publications(mock_members, mock_notify, mock_dedup):
+    with patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(OPENALEX_WORK)):
+        Command().handle(fast=True, restart=False)
+
+    changed_work = {**OPENALEX_WORK, "publication_year": 2024}
+    with patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(changed_work)):
+        Command().handle(fast=True, restart=False)
+
+    assert Publication.objects.get(id=OPENALEX_WORK["id"]).year == 2024
+    assert mock_notify.call_count == 2
+
+
+def interrupted_pages(author_name, cursor="*"):
+    """First author succeeds, the run is interrupted (e.g. the process is stopped) during the second one."""
+    if author_name == "John Doe":
+        return iter([([OPENALEX_WORK], None)])
+    raise KeyboardInterrupt
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "_get_lab_members", return_value=["John Doe", "Jane Smith"])
+def test_handle_resumes_interrupted_sync(mock_members, mock_notify, mock_dedup):
+    with patch.object(Command, "iter_openalex_pages", side_effect=interrupted_pages):
+        with pytest.raises(KeyboardInterrupt):
+            Command().handle(fast=True, restart=False)
+
+    sync = PublicationSync.objects.get()
+    assert sync.status == PublicationSync.STATUS.RUNNING
+    assert sync.changed_publications == [OPENALEX_WORK["id"]]
+    assert list(sync.authors.values_list("name", "is_completed")) == [("John Doe", True), ("Jane Smith", False)]
+
+    with patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages()) as mock_pages:
+        Command().handle(fast=True, restart=False)
+        mock_pages.assert_called_once_with("Jane Smith", cursor="*")
+
+    sync.refresh_from_db()
+    assert sync.status == PublicationSync.STATUS.COMPLETED
+    # The publication saved before the crash is still reported to the admins
+    assert mock_notify.call_args.args[0][0]["title"] == OPENALEX_WORK["title"]
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "_get_lab_members", return_value=["John Doe", "Jane Smith"])
+def test_handle_restart_discards_interrupted_sync(mock_members, mock_notify, mock_dedup):
+    with patch.object(Command, "iter_openalex_pages", side_effect=interrupted_pages):
+        with pytest.raises(KeyboardInterrupt):
+            Command().handle(fast=True, restart=False)
+
+    with patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages()) as mock_pages:
+        Command().handle(fast=True, restart=True)
+        assert mock_pages.call_count == 2
+
+    assert PublicationSync.objects.filter(status=PublicationSync.STATUS.ABANDONED).count() == 1
+    assert PublicationSync.objects.filter(status=PublicationSync.STATUS.COMPLETED).count() == 1
+
+
+@patch("management.commands.getpublications.requests.get")
+@patch("management.commands.getpublications.time.sleep", return_value=None)
+def test_iter_openalex_pages_starts_from_cursor(mock_sleep, mock_get):
+    author_response = MagicMock()
+    author_response.json.return_value = {"results": [{"id": "https://openalex.org/A123", "display_name": "John Doe"}]}
+    page_response = MagicMock()
+    page_response.json.return_value = {"results": [{"id": "work2"}], "meta": {"next_cursor": None, "count": 2}}
+    mock_get.side_effect = [author_response, page_response]
+
+    pages = list(Command().iter_openalex_pages("John Doe", cursor="abc"))
+
+    assert pages == [([{"id": "work2"}], None)]
+    assert mock_get.call_args.kwargs["params"]["cursor"] == "abc"
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(OPENALEX_WORK))
+@patch.object(Command, "_get_lab_members", return_value=["John Doe"])
+def test_handle_reports_metrics_and_writes_profile(mock_members, mock_openalex, mock_notify, mock_dedup, tmp_path):
+    profile_path = tmp_path / "sync.prof"
+    command = Command()
+
+    command.handle(fast=True, restart=False, profile=str(profile_path))
+
+    assert profile_path.exists()
+    assert command.metrics.counters["rows_written"] == 1
+    assert command.metrics.calls["normalize"] == 1
+    assert "db_write" in command.metrics.report()
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(OPENALEX_WORK))
+@patch.object(Command, "_get_lab_members", return_value=["John Doe"])
+def test_handle_skips_merged_publications(mock_members, mock_openalex, mock_notify, mock_dedup):
+    canonical = Publication.objects.create(id="https://openalex.org/W1", entrytype="article", citekey="w1", title=OPENALEX_WORK["title"])
+    Publication.objects.create(id=OPENALEX_WORK["id"], entrytype="article", citekey="w123", duplicate_of=canonical, year=2023)
+    publication_admin = PublicationAdmin(Publication, admin.site)
+    with patch.object(PublicationAdmin, "message_user"):
+        publication_admin.merge_duplicates(None, Publication.objects.filter(id=OPENALEX_WORK["id"]))
+
+    canonical.refresh_from_db()
+    assert canonical.year == 2023
+    assert MergedPublication.objects.get().publication == canonical
+
+    command = Command()
+    command.handle(fast=True, restart=False)
+
+    # The merged publication is not created again, nor sent to the admins
+    assert list(Publication.objects.values_list("id", flat=True)) == [canonical.id]
+    assert command.metrics.counters["skipped_merged"] == 1
+    mock_notify.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "iter_openalex_pages", side_effect=openalex_pages(OPENALEX_WORK))
+@patch.object(Command, "_get_lab_members", return_value=["John Doe"])
+def test_handle_crash_before_checkpoint_reports_publications_after_resume(mock_members, mock_openalex, mock_notify, mock_dedup):
+    # Crashes after saving the publications of the page, while saving the cursor
+    with patch.object(PublicationSyncAuthor, "save", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            Command().handle(fast=True, restart=False)
+
+    # The publications are rolled back with the checkpoint
+    assert not Publication.objects.exists()
+    assert PublicationSync.objects.get().changed_publications == []
+
+    Command().handle(fast=True, restart=False)
+
+    assert PublicationSync.objects.get().status == PublicationSync.STATUS.COMPLETED
+    assert mock_notify.call_args.args[0][0]["title"] == OPENALEX_WORK["title"]
+
+
+def failing_pages(author_name, cursor="*"):
+    """The first page of John Doe is saved, then his second page always has a malformed work."""
+    if author_name != "John Doe":
+        return iter([([{**OPENALEX_WORK, "id": "https://openalex.org/W2"}], None)])
+    if cursor == "*":
+        return iter([([OPENALEX_WORK], "page-2"), ([{"id": "https://openalex.org/W3"}], None)])
+    return iter([([{"id": "https://openalex.org/W3"}], None)])
+
+
+@pytest.mark.django_db
+@patch("backend.management.commands.getpublications.PublicationDeduplicationService")
+@patch.object(Command, "_notify_admins")
+@patch.object(Command, "_get_lab_members", return_value=["John Doe", "Jane Smith"])
+def test_handle_skips_author_after_failed_attempts(mock_members, mock_notify, mock_dedup):
+    with patch.object(Command, "iter_openalex_pages", side_effect=failing_pages) as mock_pages:
+        Command().handle(fast=True, restart=False)
+
+    # Tried again from the checkpoint, then skipped without blocking the other author nor the next runs
+    assert [c.kwargs["cursor"] for c in mock_pages.call_args_list] == ["*", "page-2", "page-2", "*"]
+    sync = PublicationSync.objects.get()
+    assert sync.status == PublicationSync.STATUS.COMPLETED
+    assert sorted(sync.changed_publications) == [OPENALEX_WORK["id"], "https://openalex.org/W2"]
+    john = sync.authors.get(name="John Doe")
+    assert (john.is_completed, john.failed_attempts, john.error) == (True, Command.MAX_AUTHOR_ATTEMPTS, "KeyError: 'title'")
@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.models import Publication, ScholarEnrichment
+from backend.services.google_scholar_enrichment_service import GoogleScholarEnrichmentService
+
+SCHOLAR_BIBTEX = """@article{dummy,
+    title = {Something for Something},
+    author = {John Smith and Alice Brown},
+    journal = {The Journal},
+    pub_year = {2021}
+}"""
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("backend.services.google_scholar_enrichment_service.time.sleep", return_value=None) as mock_sleep:
+        yield mock_sleep
+
+
+@pytest.fixture
+def mock_scholarly():
+    with patch("scholarly.scholarly") as mock:
+        mock.search_pubs.side_effect = lambda title: iter([{"bib": {"title": title}}])
+        mock.fill.side_effect = lambda publication: publication
+        mock.bibtex.return_value = SCHOLAR_BIBTEX
+        yield mock
+
+
+@pytest.fixture
+def publications(db):
+    publications = [Publication.objects.create(id=f"W{i}", entrytype="misc", citekey=f"key{i}", title=f"Title {i}") for i in range(4)]
+    GoogleScholarEnrichmentService().enqueue([p.id for p in publications])
+    return publications
+
+
+@pytest.mark.parametrize(
+    "input_title,expected_output",
+    [
+        ("Valid Title 123", "Valid Title 123"),  # nothing to clean
+        ("Title!@#$%^&*()_+", "Title!@#$%^&*()_+"),  # all valid punctuation
+        ("含有中文的标题", ""),  # non-ASCII characters removed
+        ("Title🚀WithEmoji", "TitleWithEmoji"),  # emojis removed
+        ("  Clean Me Up!  ", "Clean Me Up!"),  # trims outer whitespace
+        ("\tTab\nNewline Title", "Tab\nNewline Title"),  # keeps whitespace
+        ("", ""),  # empty string
+        ("     ", ""),  # only spaces
+    ],
+)
+def test_clean_title(input_title, expected_output):
+    service = GoogleScholarEnrichmentService()
+    assert service._clean_title(input_title) == expected_output
+
+
+@pytest.mark.django_db
+def test_run_enriches_pending_publications(mock_scholarly, publications):
+    service = GoogleScholarEnrichmentService(use_proxy=False)
+
+    assert service.run() == 4
+
+    publication = Publication.objects.get(id="W0")
+    assert publication.entrytype == "article"
+    assert publication.journal == "The Journal"
+    assert publication.author == "Smith, John and Brown, Alice"
+    assert not ScholarEnrichment.objects.filter(status=ScholarEnrichment.STATUS.PENDING).exists()
+
+
+@pytest.mark.django_db
+@patch("scholarly.ProxyGenerator")
+def test_run_sets_up_proxy_once(mock_proxy_generator, mock_scholarly, publications):
+    GoogleScholarEnrichmentService().run()
+
+    mock_proxy_generator.assert_called_once()
+    mock_scholarly.use_proxy.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_run_does_not_overwrite_approved_publications(mock_scholarly, publications):
+    Publication.objects.filter(id="W0").update(is_approved=True)
+
+    GoogleScholarEnrichmentService(use_proxy=False).run()
+
+    assert Publication.objects.get(id="W0").entrytype == "misc"
+
+
+@pytest.mark.django_db
+def test_run_stops_when_blocked_and_resumes(mock_scholarly, publications, no_sleep):
+    mock_scholarly.search_pubs.side_effect = Exception("Blocked")
+    service = GoogleScholarEnrichmentService(use_proxy=False)
+
+    assert service.run() == 0
+    assert mock_scholarly.search_pubs.call_count == service.MAX_CONSECUTIVE_FAILURES
+    assert ScholarEnrichment.objects.filter(status=ScholarEnrichment.STATUS.PENDING).count() == 4
+
+    # The delay doubles after each failure
+    delays = [call.args[0] for call in no_sleep.call_args_list]
+    assert delays == [6, 12]
+
+    mock_scholarly.search_pubs.side_effect = lambda title: iter([{"bib": {"title": title}}])
+    assert GoogleScholarEnrichmentService(use_proxy=False).run() == 4
+
+
+@pytest.mark.django_db
+def test_run_marks_unknown_publications_as_failed(mock_scholarly, publications):
+    mock_scholarly.search_pubs.side_effect = lambda title: iter([])
+
+    assert GoogleScholarEnrichmentService(use_proxy=False).run() == 0
+    assert ScholarEnrichment.objects.filter(status=ScholarEnrichment.STATUS.FAILED).count() == 4
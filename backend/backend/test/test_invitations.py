@@ -0,0 +1,126 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.models import Invitation
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client():
+    client = APIClient()
+    client.force_authenticate(user=User(username="admin", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def invitations():
+    now = timezone.now()
+    return Invitation.objects.bulk_create(
+        [
+            Invitation(email="pending@example.com", role="user", token="pending", expires_at=now + timezone.timedelta(days=1)),
+            Invitation(email="overdue@example.com", role="user", token="overdue", expires_at=now - timezone.timedelta(days=1)),
+            Invitation(email="registered@example.com", role="user", token="registered", expires_at=now, status=Invitation.STATUS_REGISTERED),
+            Invitation(email="canceled@example.com", role="user", token="canceled", expires_at=now, status=Invitation.STATUS_CANCELED),
+        ]
+    )
+
+
+def test_expireinvitations_marks_overdue_invitations(invitations):
+    with CaptureQueriesContext(connection) as queries:
+        call_command("expireinvitations")
+
+    assert len(queries) == 1
+    assert dict(Invitation.objects.values_list("token", "status")) == {
+        "pending": Invitation.STATUS_PENDING,
+        "overdue": Invitation.STATUS_EXPIRED,
+        "registered": Invitation.STATUS_REGISTERED,
+        "canceled": Invitation.STATUS_CANCELED,
+    }
+
+
+def test_invitation_stats_count_overdue_invitations_as_expired(admin_client, invitations):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/api/invitations/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"total": 4, "pending": 1, "registered": 1, "expired": 1, "canceled": 1}
+    assert len(queries) == 1
+
+
+def test_invitation_stats_require_an_admin():
+    response = APIClient().get("/api/invitations/stats")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def create_history(count):
+    invitations = Invitation.objects.bulk_create(
+        [
+            Invitation(email=f"user{i}@example.com", role="user", token=f"token{i}", expires_at=timezone.now() + timezone.timedelta(days=1))
+            for i in range(count)
+        ]
+    )
+    # One invitation per day, the last one today
+    for i, invitation in enumerate(invitations):
+        invitation.sent_at = timezone.now() - timezone.timedelta(days=count - 1 - i)
+    Invitation.objects.bulk_update(invitations, ["sent_at"])
+    return invitations
+
+
+def test_invitations_are_listed_most_recent_first():
+    create_history(3)
+
+    response = APIClient().get("/api/invitations")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [invitation["email"] for invitation in response.data] == ["user2@example.com", "user1@example.com", "user0@example.com"]
+
+
+def test_invitations_keyset_pagination():
+    create_history(25)
+    client = APIClient()
+
+    response = client.get("/api/invitations", {"limit": 10})
+    emails = [invitation["email"] for invitation in response.data["results"]]
+    assert response.data["count"] == 25
+    assert response.data["previous"] is None
+
+    while response.data["next"]:
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(response.data["next"])
+        # The next pages are not counted again
+        assert response.data["count"] is None
+        assert len(queries) == 1
+        emails += [invitation["email"] for invitation in response.data["results"]]
+
+    assert emails == [f"user{i}@example.com" for i in reversed(range(25))]
+
+
+def test_invitations_filters():
+    invitations = create_history(10)
+    Invitation.objects.filter(id=invitations[8].id).update(status=Invitation.STATUS_REGISTERED, email="Someone@lab.org")
+    today = timezone.localdate()
+
+    response = APIClient().get(
+        "/api/invitations",
+        {"status": "pending", "email": "USER", "sent_after": today - timezone.timedelta(days=3), "sent_before": today, "limit": 5},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert [invitation["email"] for invitation in response.data["results"]] == ["user9@example.com", "user7@example.com", "user6@example.com"]
+    assert APIClient().get("/api/invitations", {"email": "someone"}).data[0]["status"] == Invitation.STATUS_REGISTERED
+
+
+def test_invitations_reject_invalid_filters():
+    response = APIClient().get("/api/invitations", {"status": "unknown", "sent_after": "yesterday"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"status", "sent_after"}
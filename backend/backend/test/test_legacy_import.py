@@ -0,0 +1,110 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.models import Award, AwardRecipient, Course, Member
+from backend.services.legacy_import_service import LegacyImportService
+
+pytestmark = pytest.mark.django_db
+
+
+def write_csv(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def members_rows(count):
+    return [{"first_name": f"First{i}", "last_name": f"Last{i}", "role": "PHD", "email": "", "status": "CRT", "biography": ""} for i in range(count)]
+
+
+def test_import_bundled_data_is_idempotent():
+    call_command("insert_legacy_data")
+    counts = (Member.objects.count(), Award.objects.count(), AwardRecipient.objects.count(), Course.objects.count())
+
+    call_command("insert_legacy_data")
+
+    assert counts == (Member.objects.count(), Award.objects.count(), AwardRecipient.objects.count(), Course.objects.count())
+    assert counts[0] > 0 and counts[1] > 0 and counts[2] > 0 and counts[3] > 0
+    assert Course.objects.filter(teacher__first_name="Ali", teacher__last_name="Ouni").count() == counts[3]
+
+
+def test_import_runs_a_constant_number_of_queries(tmp_path):
+    members = write_csv(tmp_path / "members.csv", members_rows(250))
+    courses = write_csv(
+        tmp_path / "courses.csv",
+        [{"title": f"Course {i}", "year": 2020, "semester": "F", "teacher": f"First{i}, Last{i}", "code": f"LOG{i}"} for i in range(250)],
+    )
+    awards = tmp_path / "awards.jsonl"
+    awards.write_text("\n".join(json.dumps({"title": f"Award {i}", "year": "2021", "award_recipients": [f"First{i}, Last{i}"]}) for i in range(250)))
+
+    with CaptureQueriesContext(connection) as queries:
+        LegacyImportService(batch_size=100).run(members=members, awards=awards, courses=courses)
+
+    assert Member.objects.count() == 250
+    assert AwardRecipient.objects.count() == 250
+    assert Course.objects.count() == 250
+    # Loading the maps, then a few queries per batch of 100 rows
+    assert len(queries) < 40
+
+
+def test_import_updates_existing_rows(tmp_path):
+    member = Member.objects.create(first_name="First0", last_name="Last0", role="MSC", phone="514")
+    rows = members_rows(2)
+    rows[0]["email"] = "first0@example.com"
+
+    stats = LegacyImportService().run(members=write_csv(tmp_path / "members.csv", rows))
+
+    member.refresh_from_db()
+    assert (member.role, member.email, member.phone) == ("PHD", "first0@example.com", "514")
+    assert stats["members"]["created"] == 1 and stats["members"]["updated"] == 1
+
+
+def test_import_leaves_unchanged_rows_alone(tmp_path):
+    members = write_csv(tmp_path / "members.csv", members_rows(5))
+    LegacyImportService().run(members=members)
+
+    with CaptureQueriesContext(connection) as queries:
+        stats = LegacyImportService().run(members=members)
+
+    assert stats["members"] == {"created": 0, "updated": 0, "skipped": 0, "seconds": stats["members"]["seconds"]}
+    assert not [query for query in queries if query["sql"].startswith(("INSERT", "UPDATE"))]
+
+
+def test_import_skips_courses_of_unknown_teachers(tmp_path):
+    courses = write_csv(tmp_path / "courses.csv", [{"title": "Course", "year": 2020, "semester": "F", "teacher": "Nobody, Here", "code": "LOG1"}])
+
+    stats = LegacyImportService().run(courses=courses)
+
+    assert stats["courses"]["skipped"] == 1
+    assert not Course.objects.exists()
+
+
+def test_import_is_all_or_nothing(tmp_path):
+    members = write_csv(tmp_path / "members.csv", members_rows(3))
+    awards = tmp_path / "awards.json"
+    awards.write_text(json.dumps([{"title": "Award", "year": "not a year"}]))
+
+    with pytest.raises(ValueError):
+        LegacyImportService().run(members=members, awards=awards)
+
+    assert not Member.objects.exists()
+
+
+def test_benchmarklegacyimport_command():
+    out = StringIO()
+
+    call_command("benchmarklegacyimport", rows=20, batch_size=10, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("Strategy")
+    assert [line.split()[:2] for line in lines[1:]] == [["per-row", "60"], ["bulk", "60"], ["bulk-again", "60"]]
+    # Rolled back
+    assert not Member.objects.exists()
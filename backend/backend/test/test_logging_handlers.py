@@ -0,0 +1,86 @@
+import logging
+import queue
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from backend.logging_handlers import BackgroundQueueHandler, SamplingFilter
+
+
+def make_record(name, level, msg="message %s", args=("arg",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_one_record_out_of_rate():
+    sampling = SamplingFilter(rates={"backend.sync": 3})
+
+    kept = [sampling.filter(make_record("backend.sync.worker", logging.DEBUG)) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+
+
+def test_sampling_filter_with_rate_zero_drops_all_records():
+    sampling = SamplingFilter(rates={"backend.sync": 0})
+
+    assert not any(sampling.filter(make_record("backend.sync", logging.DEBUG)) for _ in range(3))
+    assert sampling.filter(make_record("backend.sync", logging.INFO))
+
+
+def test_sampling_filter_ignores_other_loggers_and_higher_levels():
+    sampling = SamplingFilter(rates={"backend.sync": 100})
+    sampling.filter(make_record("backend.sync", logging.DEBUG))
+
+    assert sampling.filter(make_record("backend.sync", logging.INFO))
+    assert sampling.filter(make_record("backend.synchronisation", logging.DEBUG))
+    assert sampling.filter(make_record("backend.views", logging.DEBUG))
+
+
+class ThreadRecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.emitted = []
+
+    def emit(self, record):
+        self.emitted.append((threading.current_thread(), self.format(record)))
+
+
+def test_queue_handler_writes_records_on_background_thread():
+    target = ThreadRecordingHandler()
+    handler = BackgroundQueueHandler(queue.Queue())
+    handler.listener = logging.handlers.QueueListener(handler.queue, target)
+
+    handler.handle(make_record("backend.test", logging.INFO))
+    handler.listener.stop()
+
+    [(thread, message)] = target.emitted
+    assert message == "message arg"
+    assert thread is not threading.main_thread()
+
+
+def test_queue_handler_starts_a_new_listener_after_fork():
+    target = ThreadRecordingHandler()
+    handler = BackgroundQueueHandler(queue.Queue())
+    handler.listener = parent_listener = logging.handlers.QueueListener(handler.queue, target, respect_handler_level=True)
+    handler.handle(make_record("backend.test", logging.INFO, "parent", ()))
+
+    with patch("backend.logging_handlers.os.getpid", return_value=-1):
+        handler.handle(make_record("backend.test", logging.INFO, "child", ()))
+        handler.listener.stop()
+    parent_listener.stop()
+
+    assert handler.listener is not parent_listener
+    assert handler.listener.handlers == (target,)
+    assert handler.listener.respect_handler_level
+    assert sorted(message for _, message in target.emitted) == ["child", "parent"]
+
+
+def test_benchmarklogging_command():
+    out = StringIO()
+
+    call_command("benchmarklogging", requests=5, records=2, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("Pipeline")
+    assert [line.split()[:2] for line in lines[1:]] == [["direct", "INFO"], ["queue", "INFO"], ["direct", "DEBUG"], ["queue", "DEBUG"]]
@@ -2,6 +2,8 @@ import uuid
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -141,3 +143,52 @@ def test_member_put_unauthorized(member_url):
     response = client.put(member_url, {"id": str(member.id), "first_name": "Updated"}, format="json")
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.fixture
+def members():
+    users = [User.objects.create(username=f"user{i}", is_active=i != 2) for i in range(3)]
+    return [
+        Member.objects.create(first_name="Ada", last_name="Lovelace", role="PRO", status="CRT", biography="Long biography", user=users[0]),
+        Member.objects.create(first_name="Alan", last_name="Turing", role="PHD", status="CRT", user=users[1]),
+        Member.objects.create(first_name="Inactive", last_name="User", role="PRO", status="CRT", user=users[2]),
+        Member.objects.create(first_name="Grace", last_name="Hopper", role="PRO", status="GRD"),
+    ]
+
+
+def test_get_members_list_loads_the_users_with_the_members(members, member_url):
+    with CaptureQueriesContext(connection) as queries:
+        response = APIClient().get(member_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(member["last_name"] for member in response.data) == ["Hopper", "Lovelace", "Turing"]
+    assert sorted(member["user"]["username"] for member in response.data if member["user"]) == ["user0", "user1"]
+    # The members with their users, then the groups and the permissions of the users
+    assert len(queries) == 3
+
+
+def test_get_members_directory_filtered_by_role_and_status(members, member_url):
+    with CaptureQueriesContext(connection) as queries:
+        response = APIClient().get(member_url, {"view": "directory", "role": "PRO", "status": "CRT"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [member["last_name"] for member in response.data] == ["Lovelace"]
+    assert "biography" not in response.data[0] and "user" not in response.data[0]
+    assert len(queries) == 1
+
+
+def test_get_members_rejects_invalid_filters(member_url):
+    response = APIClient().get(member_url, {"role": "XYZ", "view": "compact"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"role", "view"}
+
+
+def test_get_member_detail(members):
+    response = APIClient().get(reverse("member-detail", args=[members[0].id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["biography"] == "Long biography"
+    assert response.data["user"]["username"] == "user0"
+    # The members of inactive users are hidden, like in the list
+    assert APIClient().get(reverse("member-detail", args=[members[2].id])).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,66 @@
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from backend.services.prometheus_metrics_service import HTTP_REQUESTS, Counter, Histogram, MetricsRegistry
+
+pytestmark = pytest.mark.django_db
+client = APIClient()
+
+
+def test_counter_renders_one_line_per_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="b")
+
+    assert registry.render() == '# HELP jobs_total Jobs.\n# TYPE jobs_total counter\njobs_total{kind="a"} 1.0\njobs_total{kind="b"} 2.0\n'
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert histogram.collect() == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_labels_are_escaped():
+    counter = Counter("errors_total", "Errors.", ("message",))
+    counter.inc(message='say "hi"\n')
+
+    assert counter.collect() == ['errors_total{message="say \\"hi\\"\\n"} 1.0']
+
+
+@override_settings(DEBUG=True)
+def test_metrics_endpoint_records_requests_by_route():
+    before = HTTP_REQUESTS.value(view="api/researches", method="GET", status=200)
+    client.get("/api/researches")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert HTTP_REQUESTS.value(view="api/researches", method="GET", status=200) == before + 1
+    content = response.content.decode()
+    assert 'http_requests_total{view="api/researches",method="GET",status="200"}' in content
+    assert 'db_queries_per_request_bucket{view="api/researches",le="1.0"}' in content
+
+
+@override_settings(METRICS_TOKEN="secret")
+def test_metrics_endpoint_requires_token():
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+@override_settings(METRICS_TOKEN="", DEBUG=False)
+def test_metrics_endpoint_is_hidden_without_token_in_production():
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,58 @@
+import importlib
+import json
+import re
+from unittest.mock import patch
+
+import config.urls
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, RequestFactory, override_settings
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from backend.views.openapi_views import openapi_schema_view
+
+
+def test_generateopenapi_writes_schema(tmp_path):
+    output = tmp_path / "static" / "openapi.json"
+
+    call_command("generateopenapi", output=output)
+
+    schema = json.loads(output.read_text())
+    assert schema["info"]["title"] == "STIL API"
+    assert "/api/members" in schema["paths"]
+    assert schema["paths"]["/api/invitations"]["get"]["summary"] == "List invitations"
+
+
+@pytest.fixture
+def collected_static(tmp_path):
+    """Static files collected like in the image: the generated schema, then `collectstatic` with the manifest storage."""
+    schema_dir = tmp_path / "schema"
+    call_command("generateopenapi", output=schema_dir / settings.OPENAPI_SCHEMA_FILE)
+    with override_settings(STATICFILES_DIRS=[schema_dir], STATIC_ROOT=tmp_path / "staticfiles"):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        yield
+
+
+def test_openapi_schema_view_redirects_to_static_file(collected_static):
+    response = openapi_schema_view(RequestFactory().get("/openapi.json"))
+
+    assert response.status_code == 302
+    assert re.fullmatch(r"/static/openapi\.\w+\.json", response["Location"])
+
+
+@override_settings(DEBUG=False, SWAGGER_ENABLED=True)
+def test_production_swagger_ui_loads_the_generated_schema(collected_static):
+    urls = importlib.reload(config.urls)
+    try:
+        with override_settings(ROOT_URLCONF=urls), patch.object(OpenAPISchemaGenerator, "get_schema") as mock_get_schema:
+            response = Client().get("/swagger/")
+    finally:
+        importlib.reload(config.urls)
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert re.search(r'"url": "/static/openapi\.\w+\.json"', content)
+    # The files of the Swagger UI are in the manifest too
+    assert re.search(r"/static/drf-yasg/swagger-ui-dist/favicon-32x32\.\w+\.png", content)
+    mock_get_schema.assert_not_called()
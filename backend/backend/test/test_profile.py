@@ -1,9 +1,16 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.authentication import user_cache
+from backend.models import Member
 
 pytestmark = pytest.mark.django_db
 client = APIClient()
@@ -14,37 +21,39 @@ def profile_url():
     return reverse("profile")
 
 
+@pytest.fixture
+def mock_member():
+    """Member of the authenticated user, also returned when the profile update loads it again."""
+    mock_member = MagicMock()
+    with patch("backend.views.profile_views.Member.objects") as mock_objects:
+        mock_objects.select_related.return_value.get.return_value = mock_member
+        yield mock_member
+
+
 @patch("backend.views.profile_views.MemberSerializer")
-@patch("backend.views.profile_views.get_object_or_404")
-def test_profile_get_success(mock_get_object, mock_serializer, profile_url):
+def test_profile_get_success(mock_serializer, profile_url):
     mock_member = MagicMock()
-    mock_get_object.return_value = mock_member
 
     mock_serializer_instance = MagicMock()
     mock_serializer_instance.data = {"first_name": "Dev", "last_name": "Dev"}
     mock_serializer.return_value = mock_serializer_instance
 
-    client.force_authenticate(user=MagicMock())
+    client.force_authenticate(user=MagicMock(member=mock_member))
     response = client.get(profile_url)
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data == {"first_name": "Dev", "last_name": "Dev"}
-    mock_get_object.assert_called_once()
     mock_serializer.assert_called_once_with(mock_member)
 
 
 @patch("backend.views.profile_views.MemberSerializer")
-@patch("backend.views.profile_views.get_object_or_404")
-def test_profile_patch_success(mock_get_object, mock_serializer, profile_url):
-    mock_member = MagicMock()
-    mock_get_object.return_value = mock_member
-
+def test_profile_patch_success(mock_serializer, mock_member, profile_url):
     mock_serializer_instance = MagicMock()
     mock_serializer_instance.is_valid.return_value = True
     mock_serializer_instance.data = {"first_name": "Updated"}
     mock_serializer.return_value = mock_serializer_instance
 
-    client.force_authenticate(user=MagicMock())
+    client.force_authenticate(user=MagicMock(member=mock_member))
     response = client.patch(profile_url, {"first_name": "Updated"}, format="json")
 
     assert response.status_code == status.HTTP_200_OK
@@ -55,17 +64,13 @@ def test_profile_patch_success(mock_get_object, mock_serializer, profile_url):
 
 
 @patch("backend.views.profile_views.MemberSerializer")
-@patch("backend.views.profile_views.get_object_or_404")
-def test_profile_patch_invalid_data(mock_get_object, mock_serializer, profile_url):
-    mock_member = MagicMock()
-    mock_get_object.return_value = mock_member
-
+def test_profile_patch_invalid_data(mock_serializer, mock_member, profile_url):
     mock_serializer_instance = MagicMock()
     mock_serializer_instance.is_valid.return_value = False
     mock_serializer_instance.errors = {"first_name": ["This field is required."]}
     mock_serializer.return_value = mock_serializer_instance
 
-    client.force_authenticate(user=MagicMock())
+    client.force_authenticate(user=MagicMock(member=mock_member))
     response = client.patch(profile_url, {"first_name": ""}, format="json")
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -73,17 +78,13 @@ def test_profile_patch_invalid_data(mock_get_object, mock_serializer, profile_ur
 
 
 @patch("backend.views.profile_views.MemberSerializer")
-@patch("backend.views.profile_views.get_object_or_404")
-def test_profile_put_success(mock_get_object, mock_serializer, profile_url):
-    mock_member = MagicMock()
-    mock_get_object.return_value = mock_member
-
+def test_profile_put_success(mock_serializer, mock_member, profile_url):
     mock_serializer_instance = MagicMock()
     mock_serializer_instance.is_valid.return_value = True
     mock_serializer_instance.data = {"first_name": "Updated"}
     mock_serializer.return_value = mock_serializer_instance
 
-    client.force_authenticate(user=MagicMock())
+    client.force_authenticate(user=MagicMock(member=mock_member))
     response = client.put(profile_url, {"first_name": "Updated"}, format="json")
 
     assert response.status_code == status.HTTP_200_OK
@@ -94,18 +95,77 @@ def test_profile_put_success(mock_get_object, mock_serializer, profile_url):
 
 
 @patch("backend.views.profile_views.MemberSerializer")
-@patch("backend.views.profile_views.get_object_or_404")
-def test_profile_put_invalid_data(mock_get_object, mock_serializer, profile_url):
-    mock_member = MagicMock()
-    mock_get_object.return_value = mock_member
-
+def test_profile_put_invalid_data(mock_serializer, mock_member, profile_url):
     mock_serializer_instance = MagicMock()
     mock_serializer_instance.is_valid.return_value = False
     mock_serializer_instance.errors = {"first_name": ["This field is required."]}
     mock_serializer.return_value = mock_serializer_instance
 
-    client.force_authenticate(user=MagicMock())
+    client.force_authenticate(user=MagicMock(member=mock_member))
     response = client.put(profile_url, {"first_name": ""}, format="json")
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "first_name" in response.data
+
+
+@pytest.fixture
+def member_token():
+    user_cache.clear()
+    user = User.objects.create_user(username="dev", email="dev@example.com", password="StrongPass123")
+    member = Member.objects.create(user=user, first_name="Dev", last_name="Dev", email="dev@example.com")
+    yield member, f"Bearer {AccessToken.for_user(user)}"
+    user_cache.clear()
+
+
+def test_profile_user_and_member_are_cached(member_token, profile_url):
+    member, token = member_token
+    token_client = APIClient(HTTP_AUTHORIZATION=token)
+
+    # The user and its member are loaded together, then the groups and permissions
+    with CaptureQueriesContext(connection) as queries:
+        response = token_client.get(profile_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == 3
+
+    with CaptureQueriesContext(connection) as queries:
+        response = token_client.get(profile_url)
+    assert response.data["first_name"] == "Dev"
+    assert len(queries) == 0
+
+
+def test_profile_cache_is_invalidated_on_save(member_token, profile_url):
+    member, token = member_token
+    token_client = APIClient(HTTP_AUTHORIZATION=token)
+    token_client.get(profile_url)
+
+    Member.objects.filter(pk=member.pk).update(first_name="Stale")
+    member.first_name = "Updated"
+    member.save()
+    assert token_client.get(profile_url).data["first_name"] == "Updated"
+
+    member.user.is_active = False
+    member.user.save()
+    assert token_client.get(profile_url).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_profile_without_member(profile_url):
+    user = User.objects.create_user(username="nomember", password="StrongPass123")
+
+    response = APIClient(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}").get(profile_url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_profile_update_does_not_change_the_cached_member(member_token, profile_url):
+    member, token = member_token
+    token_client = APIClient(HTTP_AUTHORIZATION=token)
+    token_client.get(profile_url)
+    cached_member = user_cache.get(str(member.user_id)).member
+
+    response = token_client.patch(profile_url, {"first_name": "Updated", "email": "not-an-email"}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = token_client.patch(profile_url, {"first_name": "Updated"}, format="json")
+    assert response.data["first_name"] == "Updated"
+    assert cached_member.first_name == "Dev"
+    assert token_client.get(profile_url).data["first_name"] == "Updated"
@@ -0,0 +1,97 @@
+import pytest
+
+from backend.models import Publication
+from backend.services.publication_deduplication_service import PublicationDeduplicationService
+
+
+@pytest.fixture
+def service():
+    return PublicationDeduplicationService()
+
+
+def make_publication(id, title, author="Ouni, Ali and Chouchen, Moataz", **kwargs):
+    return Publication(id=id, entrytype=kwargs.pop("entrytype", "article"), citekey=id, title=title, author=author, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "input_title,expected_output",
+    [
+        ("Refactoring: A Study!", "refactoring a study"),
+        ("  Évaluation   des   Tests ", "evaluation des tests"),
+        ("", ""),
+        (None, ""),
+    ],
+)
+def test_normalize_title(input_title, expected_output):
+    assert PublicationDeduplicationService.normalize_title(input_title) == expected_output
+
+
+@pytest.mark.parametrize(
+    "input_doi,expected_output",
+    [
+        ("https://doi.org/10.1000/ABC", "10.1000/abc"),
+        ("http://dx.doi.org/10.1000/abc", "10.1000/abc"),
+        ("10.1000/abc", "10.1000/abc"),
+        (None, ""),
+    ],
+)
+def test_normalize_doi(input_doi, expected_output):
+    assert PublicationDeduplicationService.normalize_doi(input_doi) == expected_output
+
+
+def test_find_clusters_groups_similar_titles(service):
+    preprint = make_publication("p1", "On the Detection of Code Smells in Pull Requests", url="https://arxiv.org/abs/1234")
+    journal = make_publication("p2", "On the detection of code smells in pull-requests.")
+    other = make_publication("p3", "A Completely Different Paper About Continuous Integration")
+
+    clusters = service.find_clusters([preprint, journal, other])
+
+    assert len(clusters) == 1
+    assert {p.id for p in clusters[0]} == {"p1", "p2"}
+
+
+def test_find_clusters_groups_same_doi(service):
+    first = make_publication("p1", "Short title", doi="https://doi.org/10.1000/abc")
+    second = make_publication("p2", "Something else entirely", doi="10.1000/ABC")
+
+    clusters = service.find_clusters([first, second])
+
+    assert len(clusters) == 1
+
+
+def test_find_clusters_requires_author_overlap(service):
+    first = make_publication("p1", "An Empirical Study of Technical Debt", author="Ouni, Ali and Chouchen, Moataz")
+    second = make_publication("p2", "An Empirical Study of Technical Debt", author="Smith, John and Brown, Alice")
+
+    assert service.find_clusters([first, second]) == []
+
+
+def test_find_clusters_skips_ignored_publications(service):
+    first = make_publication("p1", "An Empirical Study of Technical Debt")
+    second = make_publication("p2", "An Empirical Study of Technical Debt", dedup_ignored=True)
+
+    assert service.find_clusters([first, second]) == []
+
+
+def test_choose_canonical_prefers_approved_then_published_version(service):
+    preprint = make_publication("p1", "T", url="https://zenodo.org/records/1", entrytype="misc")
+    conference = make_publication("p2", "T", booktitle="ICSE", entrytype="inproceedings")
+    journal = make_publication("p3", "T", journal="TSE", entrytype="article")
+
+    assert service.choose_canonical([preprint, conference, journal]) == journal
+
+    preprint.is_approved = True
+    assert service.choose_canonical([preprint, conference, journal]) == preprint
+
+
+@pytest.mark.django_db
+def test_run_links_duplicates_to_canonical(service):
+    make_publication("p1", "On the Detection of Code Smells in Pull Requests", url="https://arxiv.org/abs/1234", entrytype="misc").save()
+    make_publication("p2", "On the Detection of Code Smells in Pull Requests", journal="TSE").save()
+    make_publication("p3", "A Completely Different Paper About Continuous Integration").save()
+
+    assert service.run() == 1
+
+    assert Publication.objects.get(id="p1").duplicate_of_id == "p2"
+    assert Publication.objects.get(id="p2").duplicate_of_id is None
+    assert Publication.objects.get(id="p3").duplicate_of_id is None
@@ -170,6 +170,17 @@ def test_google_scholar_to_fields_dict(service, raw_bibtex, expected_dict):
             },
             {"title": "Something for Something", "publisher": "Zenodo Org", "year": "2023"},
         ),
+        (
+            {
+                "title": "Something for Something",
+                "doi": "https://doi.org/10.1000/xyz123",
+                "authorships": [],
+                "primary_location": None,
+                "type": "journal-article",
+                "publication_year": 2023,
+            },
+            {"title": "Something for Something", "year": "2023", "doi": "10.1000/xyz123"},
+        ),
     ],
 )
 def test_openalex_to_fields_dict(service, input_data, expected_fields):
@@ -3,10 +3,14 @@ from datetime import date
 from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
 
+from backend.models import Member, ProjectParticipant, ResearchProject
 from backend.serializers.research_serializer import ResearchSerializer
 
 pytestmark = pytest.mark.django_db
@@ -78,36 +82,53 @@ def test_research_post_invalid_data(mock_get_member, mock_serializer, research_u
     mock_serializer_instance.save.assert_not_called()
 
 
-@patch("backend.serializers.research_serializer.Member.objects.get")
-@patch("backend.serializers.research_serializer.ProjectParticipant.objects.create")
-@patch("backend.serializers.research_serializer.ResearchProject.objects.create")
-def test_research_serializer_create_with_participants(mock_project_create, mock_participant_create, mock_member_get):
-    mock_member = MagicMock()
-    mock_member_get.return_value = mock_member
-
-    mock_project = MagicMock()
-    mock_project_create.return_value = mock_project
-
-    participant_id = uuid.uuid4()
+def test_research_serializer_create_with_participants():
+    leader = Member.objects.create(first_name="Ada", last_name="Lovelace", role="PI")
+    participants = Member.objects.bulk_create([Member(first_name=f"First{i}", last_name=f"Last{i}", role="PHD") for i in range(3)])
 
     data = {
         "title": "AI Research",
         "start_date": date.today(),
         "description": "Deep learning models",
-        "participants": [{"id": participant_id}],
+        "leader": leader,
+        "participants": [{"id": member.id} for member in participants],
     }
 
     serializer = ResearchSerializer()
     instance = serializer.create(data)
 
-    mock_project_create.assert_called_once_with(
-        title="AI Research",
-        start_date=data["start_date"],
-        description="Deep learning models",
-    )
-    mock_member_get.assert_called_once_with(id=participant_id)
-    mock_participant_create.assert_called_once_with(project=mock_project, member=mock_member)
-    assert instance == mock_project
+    assert instance.title == "AI Research"
+    assert set(ProjectParticipant.objects.filter(project=instance).values_list("member_id", flat=True)) == {m.id for m in participants}
+
+
+def test_research_serializer_update_diffs_participants():
+    leader = Member.objects.create(first_name="Ada", last_name="Lovelace", role="PI")
+    members = Member.objects.bulk_create([Member(first_name=f"First{i}", last_name=f"Last{i}", role="PHD") for i in range(20)])
+    project = ResearchProject.objects.create(title="Project", start_date=date.today(), description="desc", leader=leader)
+    ProjectParticipant.objects.bulk_create([ProjectParticipant(project=project, member=member) for member in members[:10]])
+    kept = dict(ProjectParticipant.objects.filter(project=project, member__in=members[5:10]).values_list("member_id", "id"))
+
+    serializer = ResearchSerializer()
+    with CaptureQueriesContext(connection) as queries:
+        serializer.update(project, {"participants": [{"id": member.id} for member in members[5:20]]})
+
+    participants = dict(ProjectParticipant.objects.filter(project=project).values_list("member_id", "id"))
+    assert participants.keys() == {member.id for member in members[5:20]}
+    # The participants that stay keep their rows
+    assert {member_id: participants[member_id] for member_id in kept} == kept
+    # Update of the project, lookup of the members, of the current participants, one delete and one insert
+    assert len([query for query in queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))]) == 5
+
+
+def test_research_serializer_update_rejects_unknown_participants():
+    leader = Member.objects.create(first_name="Ada", last_name="Lovelace", role="PI")
+    project = ResearchProject.objects.create(title="Project", start_date=date.today(), description="desc", leader=leader)
+
+    with pytest.raises(ValidationError) as exc_info:
+        ResearchSerializer().update(project, {"participants": [{"id": uuid.uuid4()}]})
+
+    assert "participants" in exc_info.value.detail
+    assert not ProjectParticipant.objects.exists()
 
 
 @patch("backend.serializers.research_serializer.ResearchProject.objects.create")
@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from backend.middleware.sql_profiling_middleware import SQLProfilingMiddleware, fingerprint
+from backend.models import Member
+
+pytestmark = pytest.mark.django_db
+
+
+def n_plus_one_view(request):
+    for i in range(6):
+        list(Member.objects.filter(id=i))
+    return HttpResponse("ok")
+
+
+@pytest.mark.parametrize(
+    "input_sql,expected_output",
+    [
+        ('SELECT * FROM "member" WHERE "id" = %s', 'SELECT * FROM "member" WHERE "id" = %s'),
+        ('SELECT * FROM "member" WHERE "id" IN (%s, %s, %s)', 'SELECT * FROM "member" WHERE "id" IN (...)'),
+        ("SELECT * FROM member WHERE name = 'Ali' LIMIT 21", "SELECT * FROM member WHERE name = ? LIMIT ?"),
+        ("SELECT *\n  FROM member", "SELECT * FROM member"),
+    ],
+)
+def test_fingerprint(input_sql, expected_output):
+    assert fingerprint(input_sql) == expected_output
+
+
+@override_settings(SQL_PROFILING=False)
+def test_middleware_disabled_by_default():
+    with pytest.raises(MiddlewareNotUsed):
+        SQLProfilingMiddleware(n_plus_one_view)
+
+
+@override_settings(SQL_PROFILING=True, SQL_PROFILING_SLOW_REQUEST_MS=10_000, SQL_PROFILING_MAX_QUERIES=100)
+def test_middleware_adds_server_timing_and_logs_duplicates(caplog):
+    middleware = SQLProfilingMiddleware(n_plus_one_view)
+
+    with caplog.at_level(logging.WARNING, logger="backend.middleware.sql_profiling_middleware"):
+        response = middleware(RequestFactory().get("/api/members"))
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="6 queries"' in response["Server-Timing"]
+
+    record = caplog.records[0]
+    assert record.event == "slow_request"
+    assert record.queries == 6
+    assert record.duplicates[0]["count"] == 6
+    assert len(record.slowest) == 5
+
+
+@override_settings(SQL_PROFILING=True, SQL_PROFILING_SLOW_REQUEST_MS=10_000, SQL_PROFILING_MAX_QUERIES=100)
+def test_middleware_does_not_log_fast_requests(caplog):
+    middleware = SQLProfilingMiddleware(lambda request: HttpResponse("ok"))
+
+    with caplog.at_level(logging.WARNING, logger="backend.middleware.sql_profiling_middleware"):
+        response = middleware(RequestFactory().get("/api/members"))
+
+    assert 'desc="0 queries"' in response["Server-Timing"]
+    assert caplog.records == []
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+
+# Cold start budgets (sum of the top-level imports of `python -X importtime`), about 3 times the current times
+MANAGE_PY_BUDGET_MS = 1500
+WORKER_BOOT_BUDGET_MS = 1500
+
+# Only imported when they are used: Google Scholar enrichment and Swagger
+LAZY_MODULES = ("scholarly", "selenium", "fake_useragent", "drf_yasg.generators", "drf_yasg.views")
+
+
+def import_times(*args):
+    """Runs python with `-X importtime` and returns the cumulative import time of each module and the total, in ms."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings", "SWAGGER_ENABLED": "False"}
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+        # The top-level imports are indented by a single space
+        if not name[1:].startswith(" "):
+            total += int(cumulative) / 1000
+    return modules, total
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("manage.py", "check"),
+        ("manage.py", "getpublications", "--help"),
+        ("manage.py", "enrichpublications", "--help"),
+    ],
+)
+def test_manage_py_cold_start(args):
+    modules, total = import_times(*args)
+
+    assert not [module for module in LAZY_MODULES if module in modules]
+    assert total < MANAGE_PY_BUDGET_MS
+
+
+def test_worker_boot():
+    # What a gunicorn worker imports before answering its first request
+    modules, total = import_times("-c", "import config.wsgi, config.urls")
+
+    assert not [module for module in LAZY_MODULES if module in modules]
+    assert total < WORKER_BOOT_BUDGET_MS
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.admin.publication_admin import PublicationAdmin
+from backend.models import Award, LabStatistic, Member, Publication
+from backend.services.google_scholar_enrichment_service import GoogleScholarEnrichmentService
+from backend.services.lab_statistics_service import LabStatisticsService
+
+pytestmark = pytest.mark.django_db
+client = APIClient()
+
+
+@pytest.fixture
+def lab():
+    user = User.objects.create(username="ada")
+    Member.objects.create(first_name="Ada", last_name="Lovelace", role="PRO", status="CRT", user=user)
+    Member.objects.create(first_name="Alan", last_name="Turing", role="PHD", status="CRT")
+    Member.objects.create(first_name="Grace", last_name="Hopper", role="PRO", status="GRD")
+    original = Publication.objects.create(id="P1", entrytype="article", citekey="p1", year=2023)
+    Publication.objects.create(id="P2", entrytype="article", citekey="p2", year=2023, duplicate_of=original)
+    Publication.objects.create(id="P3", entrytype="article", citekey="p3", year=2024)
+    Publication.objects.create(id="P4", entrytype="misc", citekey="p4")
+    Award.objects.create(title="Best paper", year=2024)
+    return user
+
+
+def test_stats_are_counted_once_then_read_with_one_query(lab):
+    response = client.get("/api/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["members"] == {"total": 3, "role": {"PRO": 2, "PHD": 1}, "status": {"CRT": 2, "GRD": 1}}
+    # The duplicates are not counted, like in the list of publications
+    assert response.data["publications"] == {"total": 3, "year": {"2023": 1, "2024": 1, "": 1}}
+    assert response.data["awards"] == {"total": 1, "year": {"2024": 1}}
+    assert response.data["events"] == {"total": 0, "domain": {}}
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/stats").data == response.data
+    assert len(queries) == 1
+
+
+def test_stats_are_refreshed_after_the_commit_of_the_changes(lab, django_capture_on_commit_callbacks):
+    LabStatisticsService().refresh()
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        Award.objects.filter(year=2024).delete()
+        Award.objects.create(title="Best thesis", year=2025)
+        lab.is_active = False
+        lab.save()
+
+    assert len(callbacks) == 3
+    stats = client.get("/api/stats").data
+    assert stats["awards"] == {"total": 1, "year": {"2025": 1}}
+    assert stats["members"]["total"] == 2
+    assert stats["members"]["role"] == {"PRO": 1, "PHD": 1}
+
+
+def test_deferred_stats_are_refreshed_once(lab, django_capture_on_commit_callbacks):
+    LabStatisticsService().refresh()
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks, LabStatisticsService.deferred():
+        for i in range(5, 10):
+            Publication.objects.create(id=f"P{i}", entrytype="article", citekey=f"p{i}", year=2025)
+        assert LabStatistic.objects.get(subject="publications", group="").count == 3
+
+    assert callbacks == []
+    assert client.get("/api/stats").data["publications"]["year"]["2025"] == 5
+
+
+def test_bulk_changes_refresh_the_stats(django_capture_on_commit_callbacks):
+    LabStatisticsService().refresh()
+    admin_client = APIClient()
+    admin_client.force_authenticate(user=User(username="admin", is_staff=True))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post("/api/awards/bulk", [{"title": "A", "year": 2020}, {"title": "B", "year": 2020}], format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert client.get("/api/stats").data["awards"] == {"total": 2, "year": {"2020": 2}}
+
+
+def test_scholar_enrichment_refreshes_the_publication_years(lab, django_capture_on_commit_callbacks):
+    LabStatisticsService().refresh()
+    GoogleScholarEnrichmentService().enqueue(["P4"])
+
+    with patch("scholarly.scholarly") as mock_scholarly, patch("backend.services.google_scholar_enrichment_service.time.sleep"):
+        mock_scholarly.search_pubs.side_effect = lambda title: iter([{"bib": {}}])
+        mock_scholarly.fill.side_effect = lambda publication: publication
+        mock_scholarly.bibtex.return_value = "@article{dummy, title = {Title}, pub_year = {2021}}"
+        with django_capture_on_commit_callbacks(execute=True):
+            assert GoogleScholarEnrichmentService(use_proxy=False).run() == 1
+
+    assert client.get("/api/stats").data["publications"]["year"] == {"2023": 1, "2024": 1, "2021": 1}
+
+
+def test_duplicate_admin_actions_refresh_the_publications_total(lab, django_capture_on_commit_callbacks):
+    LabStatisticsService().refresh()
+    publication_admin = PublicationAdmin(Publication, admin.site)
+    Publication.objects.create(id="P5", entrytype="article", citekey="p5", title="An Empirical Study of Technical Debt", doi="10.1/td")
+    Publication.objects.create(id="P6", entrytype="misc", citekey="p6", title="An Empirical Study of Technical Debt", doi="10.1/td")
+
+    with patch.object(PublicationAdmin, "message_user"), django_capture_on_commit_callbacks(execute=True):
+        publication_admin.find_duplicates(None, Publication.objects.none())
+    # P2 has no title so it is not a duplicate anymore, and one of P5 and P6 became one
+    assert client.get("/api/stats").data["publications"]["total"] == 5
+
+    with patch.object(PublicationAdmin, "message_user"), django_capture_on_commit_callbacks(execute=True):
+        publication_admin.mark_not_duplicate(None, Publication.objects.filter(duplicate_of__isnull=False))
+    assert client.get("/api/stats").data["publications"]["total"] == 6
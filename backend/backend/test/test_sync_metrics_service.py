@@ -0,0 +1,47 @@
+import logging
+from unittest.mock import patch
+
+from backend.services.sync_metrics_service import SyncMetricsService
+
+
+@patch("backend.services.sync_metrics_service.time.perf_counter", side_effect=[0.0, 1.0, 1.5, 2.0, 4.0])
+def test_stage_accumulates_durations(mock_perf_counter):
+    metrics = SyncMetricsService()
+
+    with metrics.stage("page_fetch"):
+        pass
+    with metrics.stage("page_fetch"):
+        pass
+
+    assert metrics.calls["page_fetch"] == 2
+    assert metrics.durations["page_fetch"] == 2.5
+    assert metrics.max_durations["page_fetch"] == 2.0
+
+
+def test_emit_logs_structured_events(caplog):
+    metrics = SyncMetricsService()
+    with metrics.stage("db_write"):
+        pass
+    metrics.increment("rows_written", 3)
+
+    with caplog.at_level(logging.INFO, logger="backend.services.sync_metrics_service"):
+        metrics.emit()
+
+    stage_record, summary_record = caplog.records
+    assert stage_record.event == "sync_stage"
+    assert stage_record.stage == "db_write"
+    assert stage_record.calls == 1
+    assert summary_record.event == "sync_summary"
+    assert summary_record.rows_written == 3
+
+
+def test_report_lists_stages_and_counters():
+    metrics = SyncMetricsService()
+    with metrics.stage("normalize"):
+        pass
+    metrics.increment("cache_hits", 2)
+
+    report = metrics.report()
+
+    assert "normalize" in report
+    assert "cache_hits" in report
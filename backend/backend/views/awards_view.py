@@ -11,6 +11,7 @@ from ..serializers.delete_serializer import (
     DeleteRequestSerializer,
     DeleteResponseSerializer,
 )
+from .bulk_view import BulkAPIView
 
 
 class AwardsView(APIView):
@@ -46,7 +47,6 @@ class AwardsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        print(request.data)
         serializer = AwardSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -88,3 +88,8 @@ class AwardsView(APIView):
         award = get_object_or_404(Award, id=request.data.get("id"))
         award.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AwardsBulkView(BulkAPIView):
+    model = Award
+    serializer_class = AwardSerializer
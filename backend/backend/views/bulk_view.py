@@ -0,0 +1,110 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..serializers.bulk_serializer import BulkListSerializer
+from ..services.lab_statistics_service import LabStatisticsService
+
+
+class BulkAPIView(APIView):
+    """Creates, updates or deletes a list of objects in one request and one transaction.
+
+    The body is a list of objects (a list of `{"id": ...}` to delete). The response has one result per item, in the
+    same order. If any item is invalid, nothing is saved and the valid items are reported as `skipped`.
+    """
+
+    permission_classes = [IsAdminUser]
+    model = None
+    serializer_class = None
+    # Serializer validating the new objects, when it differs from `serializer_class`
+    create_serializer_class = None
+
+    @swagger_auto_schema(operation_description="Creates the objects of the list in a single transaction")
+    def post(self, request):
+        if not self._is_list(request.data):
+            return self._not_a_list()
+
+        serializer_class = self.create_serializer_class or self.serializer_class
+        serializer = BulkListSerializer(data=request.data, child=serializer_class())
+        return self._save(serializer, "created", status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(operation_description="Updates the objects of the list (partial updates) in a single transaction")
+    def put(self, request):
+        if not self._is_list(request.data):
+            return self._not_a_list()
+
+        instances, errors = self._get_instances(request.data)
+        if errors:
+            return self._errors(errors)
+
+        serializer = BulkListSerializer(instances, data=request.data, child=self.serializer_class(partial=True), partial=True)
+        return self._save(serializer, "updated", status.HTTP_200_OK)
+
+    @swagger_auto_schema(operation_description="Deletes the objects of the list in a single transaction")
+    def delete(self, request):
+        if not self._is_list(request.data):
+            return self._not_a_list()
+
+        instances, errors = self._get_instances(request.data)
+        if errors:
+            return self._errors(errors)
+
+        with transaction.atomic():
+            statuses = self.perform_bulk_delete(instances)
+            LabStatisticsService.schedule(self.model)
+        results = [{"id": str(instance.pk), "status": instance_status} for instance, instance_status in zip(instances, statuses)]
+        return Response(results, status=status.HTTP_200_OK)
+
+    def perform_bulk_delete(self, instances):
+        """Deletes the instances and returns the status of each one."""
+        self.model.objects.filter(pk__in=[instance.pk for instance in instances]).delete()
+        return ["deleted"] * len(instances)
+
+    def _get_instances(self, items):
+        """Returns the instances of the items, in the same order, and the errors of the items without one."""
+        pk_field = self.model._meta.pk
+        ids, errors = [], []
+        for item in items:
+            try:
+                ids.append(pk_field.to_python(item.get("id")) if isinstance(item, dict) else None)
+            except DjangoValidationError:
+                ids.append(None)
+
+        instances = self.model.objects.in_bulk([pk for pk in ids if pk is not None])
+        for pk in ids:
+            errors.append({} if pk in instances else {"id": ["No object with this id."]})
+        if any(errors):
+            return None, errors
+        return [instances[pk] for pk in ids], None
+
+    def _save(self, serializer, success_status, success_code):
+        if not serializer.is_valid():
+            return self._errors(serializer.errors)
+
+        try:
+            with transaction.atomic():
+                instances = serializer.save()
+                # The objects are saved in bulk, without the signals
+                LabStatisticsService.schedule(self.model)
+        except serializers.ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = self.serializer_class(instances, many=True).data
+        results = [{"id": str(instance.pk), "status": success_status, "data": item} for instance, item in zip(instances, data)]
+        return Response(results, status=success_code)
+
+    def _errors(self, errors):
+        results = [{"status": "error", "errors": item_errors} if item_errors else {"status": "skipped"} for item_errors in errors]
+        return Response(results, status=status.HTTP_400_BAD_REQUEST)
+
+    def _is_list(self, data):
+        return isinstance(data, list) and len(data) > 0
+
+    def _not_a_list(self):
+        return Response({"error": "Expected a non-empty list of objects."}, status=status.HTTP_400_BAD_REQUEST)
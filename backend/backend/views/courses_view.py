@@ -11,6 +11,7 @@ from ..serializers.delete_serializer import (
     DeleteRequestSerializer,
     DeleteResponseSerializer,
 )
+from .bulk_view import BulkAPIView
 
 
 class CoursesView(APIView):
@@ -85,3 +86,8 @@ class CoursesView(APIView):
         course = get_object_or_404(Course, id=request.data.get("id"))
         course.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CoursesBulkView(BulkAPIView):
+    model = Course
+    serializer_class = CourseSerializer
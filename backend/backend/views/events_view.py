@@ -11,6 +11,7 @@ from ..serializers.delete_serializer import (
     DeleteResponseSerializer,
 )
 from ..serializers.event_serializer import EventSerializer
+from .bulk_view import BulkAPIView
 
 
 class EventsView(APIView):
@@ -85,3 +86,8 @@ class EventsView(APIView):
         event = get_object_or_404(Event, id=request.data.get("id"))
         event.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class EventsBulkView(BulkAPIView):
+    model = Event
+    serializer_class = EventSerializer
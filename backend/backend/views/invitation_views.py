@@ -1,21 +1,39 @@
 import secrets
+from datetime import datetime, time, timedelta
 
-from config.settings import EMAIL_HOST_USER, FRONTEND_URL
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from config.settings import FRONTEND_URL
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Lower
 from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers, status
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from backend.models.invitation import Invitation
 from backend.serializers.invitation_serializer import InvitationSerializer
+from backend.services.email_outbox_service import EmailOutboxService
+from backend.services.email_rendering_service import EmailRenderingService
 
 from ..serializers.delete_serializer import (
     DeleteResponseSerializer,
 )
 
+INVITATION_SUBJECT = "You're Invited"
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def invitation_context(email, token):
+    return {"register_url": f"{FRONTEND_URL}/register?token={token}&email={email}"}
+
 
 class ValidateInvitationTokenInputSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -26,6 +44,66 @@ class SendMailInvitationInputSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
 
+class SendBulkInvitationsInputSerializer(serializers.Serializer):
+    # The addresses are validated one by one, so an invalid address is reported without rejecting the others
+    emails = serializers.ListField(child=serializers.CharField(), allow_empty=False, max_length=1000)
+    role = serializers.CharField(max_length=50, default="user")
+
+
+class BulkInvitationResultSerializer(serializers.Serializer):
+    email = serializers.CharField()
+    status = serializers.ChoiceField(choices=["invited", "already_invited", "duplicate", "invalid"])
+
+
+class InvitationFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Invitation.STATUS_CHOICES, required=False)
+    email = serializers.CharField(required=False, help_text="Start of the email address, case insensitive.")
+    sent_after = serializers.DateField(required=False, help_text="First day of the sending dates, included.")
+    sent_before = serializers.DateField(required=False, help_text="Last day of the sending dates, included.")
+    limit = serializers.IntegerField(required=False, min_value=1, help_text="Number of invitations per page. Without it, all are returned.")
+    cursor = serializers.CharField(required=False, help_text="Cursor of the page, from the `next` or `previous` link.")
+
+    def filter(self, invitations):
+        filters = self.validated_data
+        if "status" in filters:
+            invitations = invitations.filter(status=filters["status"])
+        if "email" in filters:
+            invitations = invitations.filter(email__istartswith=filters["email"])
+        # Compared with the bounds of the days, so the index on the sending date can be used
+        if "sent_after" in filters:
+            invitations = invitations.filter(sent_at__gte=start_of_day(filters["sent_after"]))
+        if "sent_before" in filters:
+            invitations = invitations.filter(sent_at__lt=start_of_day(filters["sent_before"] + timedelta(days=1)))
+        return invitations
+
+
+class InvitationCursorPagination(CursorPagination):
+    """Keyset pagination on the sending date. Only used when the client asks for a `limit`."""
+
+    ordering = ("-sent_at", "-id")
+    page_size = None
+    page_size_query_param = "limit"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)
+        # The next pages are reached with a cursor: they do not count the invitations again
+        if page is not None:
+            self.count = None if request.query_params.get(self.cursor_query_param) else queryset.count()
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"count": self.count, "next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+
+class InvitationStatsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    pending = serializers.IntegerField()
+    registered = serializers.IntegerField()
+    expired = serializers.IntegerField()
+    canceled = serializers.IntegerField()
+
+
 class BooleanResponseSerializer(serializers.Serializer):
     success = serializers.BooleanField(required=False)
     valid = serializers.BooleanField(required=False)
@@ -33,9 +111,9 @@ class BooleanResponseSerializer(serializers.Serializer):
 
 class ValidateInvitationTokenView(APIView):
     @swagger_auto_schema(
-        request=ValidateInvitationTokenInputSerializer,
-        responses=BooleanResponseSerializer,
-        summary="Validate invitation token",
+        request_body=ValidateInvitationTokenInputSerializer,
+        responses={200: BooleanResponseSerializer},
+        operation_summary="Validate invitation token",
         tags=["Invitations"],
     )
     def post(self, request):
@@ -55,9 +133,9 @@ class ValidateInvitationTokenView(APIView):
 
 class SendMailInvitationView(APIView):
     @swagger_auto_schema(
-        request=SendMailInvitationInputSerializer,
-        responses=BooleanResponseSerializer,
-        summary="Send mail invitation",
+        request_body=SendMailInvitationInputSerializer,
+        responses={200: BooleanResponseSerializer},
+        operation_summary="Send mail invitation",
         tags=["Invitations"],
     )
     def post(self, request):
@@ -68,54 +146,98 @@ class SendMailInvitationView(APIView):
         token = secrets.token_urlsafe(32)
         expires_at = timezone.now() + timezone.timedelta(days=7)
 
-        invitation = Invitation.objects.create(email=email, role="user", token=token, expires_at=expires_at)
+        text_content, html_content = EmailRenderingService().render("invitation", invitation_context(email, token))
 
-        register_url = f"{FRONTEND_URL}/register?token={token}&email={email}"
-        context = {"register_url": register_url}
+        # The email is sent by the `sendemails` worker once the invitation is committed
+        with transaction.atomic():
+            Invitation.objects.create(email=email, role="user", token=token, expires_at=expires_at)
+            EmailOutboxService().enqueue("invitation", INVITATION_SUBJECT, [email], text_content, html_content)
 
-        try:
-            text_content = render_to_string(
-                "templates/emails/invitation.txt",
-                context=context,
-            )
+        return Response({"success": True})
 
-            html_content = render_to_string(
-                "templates/emails/invitation.html",
-                context=context,
-            )
 
-            msg = EmailMultiAlternatives(
-                "You're Invited",
-                text_content,
-                EMAIL_HOST_USER,
-                [email],
-            )
+class SendBulkInvitationsView(APIView):
+    permission_classes = [IsAdminUser]
 
-            msg.attach_alternative(html_content, "text/html")
-            msg.send()
-            success = True
-        except Exception:
-            invitation.delete()
-            success = False
+    @swagger_auto_schema(
+        request_body=SendBulkInvitationsInputSerializer,
+        responses={200: BulkInvitationResultSerializer(many=True)},
+        operation_summary="Send mail invitations to a list of addresses",
+        operation_description=(
+            "Invites every address that does not have a pending invitation yet. The result of each address is returned in "
+            "the same order: invited, already_invited (pending invitation), duplicate (earlier in the list) or invalid."
+        ),
+        tags=["Invitations"],
+    )
+    def post(self, request):
+        serializer = SendBulkInvitationsInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        role = serializer.validated_data["role"]
+
+        results, addresses = [], set()
+        for email in serializer.validated_data["emails"]:
+            email = email.strip()
+            try:
+                validate_email(email)
+            except ValidationError:
+                results.append({"email": email, "status": "invalid"})
+                continue
+            results.append({"email": email, "status": "duplicate" if email.lower() in addresses else "invited"})
+            addresses.add(email.lower())
+
+        # One query for all the addresses, compared without the case like the duplicates of the list
+        already_invited = set(
+            Invitation.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=addresses, status=Invitation.STATUS_PENDING, expires_at__gt=timezone.now())
+            .values_list("email_lower", flat=True)
+        )
+        for result in results:
+            if result["status"] == "invited" and result["email"].lower() in already_invited:
+                result["status"] = "already_invited"
+
+        expires_at = timezone.now() + timezone.timedelta(days=7)
+        invitations = [
+            Invitation(email=result["email"], role=role, token=secrets.token_urlsafe(32), expires_at=expires_at)
+            for result in results
+            if result["status"] == "invited"
+        ]
+        bodies = EmailRenderingService().render_many("invitation", [invitation_context(i.email, i.token) for i in invitations])
+        emails = [([invitation.email], text, html) for invitation, (text, html) in zip(invitations, bodies)]
+
+        # The emails are sent in batches over one SMTP connection by the `sendemails` worker
+        with transaction.atomic():
+            Invitation.objects.bulk_create(invitations)
+            EmailOutboxService().enqueue_many("invitation", INVITATION_SUBJECT, emails)
 
-        return Response({"success": success})
+        return Response(results)
 
 
 class InvitationAPIView(APIView):
     @swagger_auto_schema(
-        responses=InvitationSerializer(many=True),
-        summary="List invitations",
+        query_serializer=InvitationFilterSerializer,
+        responses={200: InvitationSerializer(many=True)},
+        operation_summary="List invitations",
+        operation_description=(
+            "Most recent invitations first. With `limit`, the response is one page: `results`, the `next` and `previous` "
+            "links (keyset cursors on the sending date) and, on the first page only, the `count` of matching invitations."
+        ),
         tags=["Invitations"],
     )
     def get(self, request):
-        invitations = Invitation.objects.all()
-        serializer = InvitationSerializer(invitations, many=True)
-        return Response(serializer.data)
+        filters = InvitationFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        invitations = filters.filter(Invitation.objects.all())
+
+        paginator = InvitationCursorPagination()
+        page = paginator.paginate_queryset(invitations, request, view=self)
+        if page is None:
+            return Response(InvitationSerializer(invitations.order_by(*paginator.ordering), many=True).data)
+        return paginator.get_paginated_response(InvitationSerializer(page, many=True).data)
 
     @swagger_auto_schema(
-        request=InvitationSerializer,
+        request_body=InvitationSerializer,
         responses={200: InvitationSerializer},
-        summary="Update invitation",
+        operation_summary="Update invitation",
         tags=["Invitations"],
     )
     def put(self, request, id=None):
@@ -132,7 +254,7 @@ class InvitationAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
-        summary="Delete invitation",
+        operation_summary="Delete invitation",
         responses={204: DeleteResponseSerializer},
         tags=["Invitations"],
     )
@@ -144,3 +266,30 @@ class InvitationAPIView(APIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
         invitation.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class InvitationStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        responses={200: InvitationStatsSerializer},
+        operation_summary="Count the invitations per status",
+        tags=["Invitations"],
+    )
+    def get(self, request):
+        # The pending invitations past their expiry date are counted as expired, even before the sweeper marks them
+        current_status = Case(
+            When(status=Invitation.STATUS_PENDING, expires_at__lte=timezone.now(), then=Value(Invitation.STATUS_EXPIRED)),
+            default=F("status"),
+        )
+        counts = dict(
+            Invitation.objects.annotate(current_status=current_status)
+            .values("current_status")
+            .annotate(count=Count("id"))
+            .order_by()
+            .values_list("current_status", "count")
+        )
+
+        stats = {key: counts.get(key, 0) for key, _ in Invitation.STATUS_CHOICES}
+        stats["total"] = sum(counts.values())
+        return Response(InvitationStatsSerializer(stats).data)
@@ -1,10 +1,13 @@
+from django.contrib.auth.models import User
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..authentication import user_cache
 from ..models.member import Member
 from ..serializers.delete_serializer import (
     DeleteRequestSerializer,
@@ -12,9 +15,34 @@ from ..serializers.delete_serializer import (
 )
 from ..serializers.member_serializer import (
     CreateMemberSerializer,
+    MemberDirectorySerializer,
     MemberSerializer,
     UpdateMemberSerializer,
 )
+from .bulk_view import BulkAPIView
+
+
+def with_user(members):
+    """Loads the user of the members with its groups and permissions, nested by `MemberSerializer`."""
+    return members.select_related("user").prefetch_related("user__groups", "user__user_permissions")
+
+
+class MemberFilterSerializer(serializers.Serializer):
+    role = serializers.ChoiceField(choices=Member.MemberRole.choices, required=False)
+    status = serializers.ChoiceField(choices=Member.MemberStatus.choices, required=False)
+    view = serializers.ChoiceField(
+        choices=["full", "directory"],
+        default="full",
+        help_text="`directory` returns only the names, role, status, research domain, image and links of the members.",
+    )
+
+    def filter(self, members):
+        filters = self.validated_data
+        if "role" in filters:
+            members = members.filter(role=filters["role"])
+        if "status" in filters:
+            members = members.filter(status=filters["status"])
+        return members
 
 
 class MemberView(APIView):
@@ -25,13 +53,19 @@ class MemberView(APIView):
 
     @swagger_auto_schema(
         operation_id="Get Members",
-        operation_description="Retrieves a list of all members",
-        responses={200: MemberSerializer},
+        operation_description="Retrieves a list of all members, optionally filtered by role and status",
+        query_serializer=MemberFilterSerializer,
+        responses={200: MemberSerializer(many=True)},
         tags=["Member"],
     )
     def get(self, request):
-        members = Member.objects.filter(user__isnull=True) | Member.objects.filter(user__is_active=True)
-        serializer = MemberSerializer(members, many=True)
+        filters = MemberFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        members = filters.filter(Member.visible())
+        if filters.validated_data["view"] == "directory":
+            serializer = MemberDirectorySerializer(members.only(*MemberDirectorySerializer.Meta.fields), many=True)
+        else:
+            serializer = MemberSerializer(with_user(members), many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -92,3 +126,37 @@ class MemberView(APIView):
         else:
             member.delete()
             return Response({"status": "deleted"}, status=status.HTTP_204_NO_CONTENT)
+
+
+class MemberDetailView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_id="Get Member",
+        operation_description="Retrieves all the information of a member",
+        responses={200: MemberSerializer},
+        tags=["Member"],
+    )
+    def get(self, request, pk):
+        member = get_object_or_404(with_user(Member.visible()), pk=pk)
+        return Response(MemberSerializer(member).data)
+
+
+class MemberBulkView(BulkAPIView):
+    model = Member
+    serializer_class = MemberSerializer
+    create_serializer_class = CreateMemberSerializer
+
+    def perform_bulk_delete(self, instances):
+        """Like a single delete, the members with an account are deactivated instead of deleted."""
+        users = [member.user_id for member in instances if member.user_id]
+        User.objects.filter(id__in=users).update(is_active=False)
+
+        def forget_users():
+            # update() sends no signal: the deactivated users are removed from the authentication cache by hand
+            for user_id in users:
+                user_cache.delete(str(user_id))
+
+        transaction.on_commit(forget_users)
+        Member.objects.filter(pk__in=[member.pk for member in instances if not member.user_id]).delete()
+        return ["deactivated" if member.user_id else "deleted" for member in instances]
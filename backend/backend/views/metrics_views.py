@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from django.utils.crypto import constant_time_compare
+
+from backend.services.prometheus_metrics_service import REGISTRY
+
+
+def metrics_view(request):
+    """Exposes the metrics of this process in the Prometheus text format.
+
+    The scraper must send `METRICS_TOKEN` as a bearer token. Without a token, the endpoint only exists in debug mode.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        return HttpResponseNotFound()
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+    return HttpResponse(REGISTRY.render(), content_type=REGISTRY.CONTENT_TYPE)
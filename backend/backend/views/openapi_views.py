@@ -0,0 +1,30 @@
+import json
+
+from config.openapi import API_INFO
+from django.conf import settings
+from django.http import HttpResponseRedirect
+from django.shortcuts import render
+from django.templatetags.static import static
+from drf_yasg.renderers import SwaggerUIRenderer
+
+
+def openapi_schema_view(request):
+    """Redirects to the schema generated by `manage.py generateopenapi`.
+
+    The static file has a hashed name, so the browsers cache it until the next deployment.
+    """
+    return HttpResponseRedirect(static(settings.OPENAPI_SCHEMA_FILE))
+
+
+def swagger_ui_view(request):
+    """Swagger UI of production, loading the schema generated by `manage.py generateopenapi`.
+
+    Renders the page of drf_yasg without its `SchemaView`, which would build the schema from the views on the workers.
+    """
+    renderer = SwaggerUIRenderer()
+    context = {"request": request}
+    renderer.set_context(context)
+    swagger_settings = renderer.get_swagger_ui_settings()
+    swagger_settings["url"] = static(settings.OPENAPI_SCHEMA_FILE)
+    context.update(title=API_INFO.title, swagger_settings=json.dumps(swagger_settings))
+    return render(request, renderer.template, context)
@@ -1,4 +1,4 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -9,6 +9,14 @@ from ..models.member import Member
 from ..serializers.member_serializer import MemberSerializer, ProfileUpdateSerializer
 
 
+def get_member(user):
+    """Returns the member of the user, loaded with the user (and cached) by the authentication."""
+    try:
+        return user.member
+    except Member.DoesNotExist:
+        raise Http404("No member for this user.")
+
+
 class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -19,7 +27,7 @@ class ProfileView(APIView):
         tags=["Profile"],
     )
     def get(self, request):
-        member = get_object_or_404(Member, user=request.user)
+        member = get_member(request.user)
         serializer = MemberSerializer(member)
         return Response(serializer.data)
 
@@ -41,7 +49,8 @@ class ProfileView(APIView):
         tags=["Profile"],
     )
     def patch(self, request):
-        member = get_object_or_404(Member, user=request.user)
+        # The cached member is shared by the requests of the user, so the changes are made on a copy loaded again
+        member = Member.objects.select_related("user").get(pk=get_member(request.user).pk)
         serializer = MemberSerializer(member, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
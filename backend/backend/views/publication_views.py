@@ -11,6 +11,7 @@ from ..serializers.delete_serializer import (
     DeleteResponseSerializer,
 )
 from ..serializers.publication_serializer import PublicationSerializer
+from .bulk_view import BulkAPIView
 
 
 class PublicationListAPI(APIView):
@@ -21,12 +22,12 @@ class PublicationListAPI(APIView):
 
     @swagger_auto_schema(
         operation_id="Get Publications",
-        operation_description="Retrieves a list of all publications",
+        operation_description="Retrieves a list of all publications. Publications suggested as duplicates of another one are left out.",
         responses={200: PublicationSerializer},
         tags=["Publication"],
     )
     def get(self, request):
-        publications = Publication.objects.all()
+        publications = Publication.objects.filter(duplicate_of__isnull=True)
         serializer = PublicationSerializer(publications, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -87,3 +88,8 @@ class PublicationListAPI(APIView):
         publication = get_object_or_404(Publication, id=request.data.get("id"))
         publication.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PublicationBulkAPI(BulkAPIView):
+    model = Publication
+    serializer_class = PublicationSerializer
@@ -0,0 +1,50 @@
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.services.lab_statistics_service import LabStatisticsService
+
+
+class TotalSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+
+
+class MemberStatisticsSerializer(TotalSerializer):
+    role = serializers.DictField(child=serializers.IntegerField())
+    status = serializers.DictField(child=serializers.IntegerField())
+
+
+class YearStatisticsSerializer(TotalSerializer):
+    year = serializers.DictField(child=serializers.IntegerField())
+
+
+class EventStatisticsSerializer(TotalSerializer):
+    domain = serializers.DictField(child=serializers.IntegerField())
+
+
+class LabStatisticsSerializer(serializers.Serializer):
+    members = MemberStatisticsSerializer()
+    publications = YearStatisticsSerializer()
+    projects = TotalSerializer()
+    awards = YearStatisticsSerializer()
+    events = EventStatisticsSerializer()
+    courses = YearStatisticsSerializer()
+    updated_at = serializers.DateTimeField(allow_null=True)
+
+
+class LabStatisticsView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        responses={200: LabStatisticsSerializer},
+        operation_summary="Count the members, publications, projects, awards, events and courses",
+        operation_description=(
+            "Totals of the objects listed by the API, with the counts per value of their main fields (an empty key "
+            "counts the objects without a value). Kept up to date when the objects change, read with one query."
+        ),
+        tags=["Statistics"],
+    )
+    def get(self, request):
+        return Response(LabStatisticsSerializer(LabStatisticsService().get()).data)
@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration used in production.
+
+    gunicorn -c config/gunicorn.conf.py config.wsgi
+
+Every value can be overridden with the environment variables below.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# The views mostly wait for PostgreSQL, so each worker runs a few threads
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+
+# Django and the application are imported once in the master and shared with the workers (copy-on-write)
+preload_app = True
+
+# Workers are replaced after a number of requests (with some jitter so they do not restart together) to bound the
+# memory growth, and get `graceful_timeout` seconds to finish their requests when restarted or stopped
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # A connection opened in the master while preloading must not be shared by the workers
+    from django.db import connections
+
+    connections.close_all()
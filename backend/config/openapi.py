@@ -0,0 +1,8 @@
+from drf_yasg import openapi
+
+# Used by the Swagger UI in development and by `manage.py generateopenapi` (SWAGGER_SETTINGS["DEFAULT_INFO"])
+API_INFO = openapi.Info(
+    title="STIL API",
+    default_version="v1",
+    license=openapi.License(name="MIT License"),
+)
@@ -15,6 +15,9 @@ ALLOWED_HOSTS = ["*"]  # ou liste restreinte de domaines
 
 LOG_LEVEL = os.getenv("DJANGO_LOG_LEVEL", "INFO").upper()
 
+# Keep one DEBUG record out of N for the loggers writing one line per item (0 drops them all)
+LOG_SAMPLE_RATES = {"backend.management.commands.getpublications": int(os.getenv("DJANGO_LOG_SAMPLE_RATE", 10))}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -28,7 +31,20 @@ LOGGING = {
             "format": "%(levelname)s %(asctime)s %(name)s %(message)s",
         },
     },
+    "filters": {
+        "sampling": {
+            "()": "backend.logging_handlers.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
+    },
     "handlers": {
+        # The records go through a queue and are formatted and written by a background thread
+        "queue": {
+            "class": "backend.logging_handlers.BackgroundQueueHandler",
+            "handlers": ["console", "file"],
+            "respect_handler_level": True,
+            "filters": ["sampling"],
+        },
         "console": {
             "class": "logging.StreamHandler",
             "level": LOG_LEVEL,
@@ -43,10 +59,10 @@ LOGGING = {
             "formatter": "json",
         },
     },
-    "root": {"handlers": ["console", "file"], "level": LOG_LEVEL},
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
@@ -63,13 +79,31 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "backend",
     "rest_framework",
+    # Always installed so that `collectstatic` collects the files of the Swagger UI, whatever SWAGGER_ENABLED is at
+    # build time. The app itself imports nothing: the schema generation is only loaded with the routes below
     "drf_yasg",
 ]
 
-REST_FRAMEWORK = {"DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",)}
+# The Swagger UI (and the schema generation of drf_yasg) is only served when enabled, by default in development
+SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", str(DEBUG)) == "True"
+
+# Generated by `manage.py generateopenapi` in the static files. In production, the Swagger UI loads it instead of
+# introspecting all the views on each visit
+OPENAPI_SCHEMA_FILE = "openapi.json"
+SWAGGER_SETTINGS = {"DEFAULT_INFO": "config.openapi.API_INFO"}
+SWAGGER_USE_COMPAT_RENDERERS = False
+
+REST_FRAMEWORK = {"DEFAULT_AUTHENTICATION_CLASSES": ("backend.authentication.CachedJWTAuthentication",)}
+
+# Users (and member profiles) kept in memory by each process after authenticating a token. 0 disables the cache
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", 60))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", 1024))
 
 MIDDLEWARE = [
+    "backend.middleware.metrics_middleware.PrometheusMetricsMiddleware",
+    "backend.middleware.sql_profiling_middleware.SQLProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -82,11 +116,12 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "config.urls"
 
+# The emails are rendered from backend/templates. The compiled templates are cached per process in every mode:
+# runserver clears the cache when a template changes
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
-        "APP_DIRS": True,
+        "DIRS": [BASE_DIR / "backend"],
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -94,6 +129,12 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    ["django.template.loaders.filesystem.Loader", "django.template.loaders.app_directories.Loader"],
+                ),
+            ],
         },
     },
 ]
@@ -106,6 +147,10 @@ CORS_ALLOWED_ORIGINS = [
     os.getenv("FRONTEND_URL", "https://ton-domaine-frontend.onrender.com"),
 ]
 
+# Each thread keeps its connection for DB_CONN_MAX_AGE seconds instead of opening one per request (0 to disable).
+# With DB_POOL=True, the connections are borrowed from a psycopg pool of each process instead
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -114,9 +159,44 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Required behind pgbouncer in transaction pooling mode
+        "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DB_PGBOUNCER", "False") == "True",
+        "OPTIONS": {},
     }
 }
 
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        # At least the number of gunicorn threads, so a request never waits for a connection
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 8)),
+        "timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+    }
+
+# The login endpoint looks up the username or the email and checks the password with the same user
+AUTHENTICATION_BACKENDS = ["backend.authentication.UsernameOrEmailBackend", "django.contrib.auth.backends.ModelBackend"]
+
+# Password hashing policy: pbkdf2, scrypt or argon2 (needs argon2-cffi). New passwords are hashed with it and the
+# existing hashes (other hasher or other parameters) are rehashed on the next login. Compared by `benchmarkhashers`
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHER_POLICIES = {
+    "pbkdf2": "backend.hashers.PBKDF2PasswordHasher",
+    "scrypt": "backend.hashers.ScryptPasswordHasher",
+    "argon2": "backend.hashers.Argon2PasswordHasher",
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASHER]] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items() if policy != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 1_000_000))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", 2**14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv("PASSWORD_SCRYPT_BLOCK_SIZE", 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", 1))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", 102400))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", 8))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -151,6 +231,13 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Served by WhiteNoise, compressed and with hashed names (cached forever by the browsers). Run `collectstatic` after each change
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -167,18 +254,12 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
-TEMPLATES = [
-    {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR / "backend"],
-        "APP_DIRS": True,
-        "OPTIONS": {
-            "context_processors": [
-                "django.template.context_processors.debug",
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-            ],
-        },
-    },
-]
+# Bearer token required to scrape /metrics. When empty, /metrics is only served with DEBUG=True
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Per-request SQL profiling (Server-Timing header and slow_request log events)
+SQL_PROFILING = os.getenv("SQL_PROFILING", "False") == "True"
+SQL_PROFILING_SLOW_REQUEST_MS = int(os.getenv("SQL_PROFILING_SLOW_REQUEST_MS", 500))
+SQL_PROFILING_MAX_QUERIES = int(os.getenv("SQL_PROFILING_MAX_QUERIES", 50))
+SQL_PROFILING_DUPLICATE_THRESHOLD = int(os.getenv("SQL_PROFILING_DUPLICATE_THRESHOLD", 5))
+SQL_PROFILING_SLOWEST_QUERIES = 5
@@ -15,48 +15,43 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 
 from backend.views.auth_views import LoginView, RegisterView
-from backend.views.awards_view import AwardsView
-from backend.views.courses_view import CoursesView
-from backend.views.events_view import EventsView
-from backend.views.invitation_views import InvitationAPIView, SendMailInvitationView, ValidateInvitationTokenView
-from backend.views.member_view import MemberView
+from backend.views.awards_view import AwardsBulkView, AwardsView
+from backend.views.courses_view import CoursesBulkView, CoursesView
+from backend.views.events_view import EventsBulkView, EventsView
+from backend.views.invitation_views import (
+    InvitationAPIView,
+    InvitationStatsView,
+    SendBulkInvitationsView,
+    SendMailInvitationView,
+    ValidateInvitationTokenView,
+)
+from backend.views.member_view import MemberBulkView, MemberDetailView, MemberView
+from backend.views.metrics_views import metrics_view
 from backend.views.profile_views import ProfileView
-from backend.views.publication_views import PublicationListAPI
+from backend.views.publication_views import PublicationBulkAPI, PublicationListAPI
 from backend.views.research_views import ResearchAPI
 from backend.views.run_getpublications_command_views import (
     RunGetPublicationsCommandAPIView,
 )
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="STIL API",
-        default_version="v1",
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+from backend.views.stats_views import LabStatisticsView
 
 urlpatterns = [
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="swagger",
-    ),
     path("admin/", admin.site.urls),
     path("api/register", RegisterView.as_view(), name="register"),
     path("api/login", LoginView.as_view(), name="login"),
     path("api/publications", PublicationListAPI.as_view(), name="publication-list"),
+    path("api/publications/bulk", PublicationBulkAPI.as_view(), name="publication-bulk"),
     path("api/profile", ProfileView.as_view(), name="profile"),
     path("api/members", MemberView.as_view(), name="member-list"),
+    path("api/members/bulk", MemberBulkView.as_view(), name="member-bulk"),
+    path("api/members/<uuid:pk>", MemberDetailView.as_view(), name="member-detail"),
     path("api/awards", AwardsView.as_view(), name="awards"),
+    path("api/awards/bulk", AwardsBulkView.as_view(), name="awards-bulk"),
     path("api/researches", ResearchAPI.as_view(), name="research"),
     path(
         "run-getpublications-command",
@@ -64,9 +59,29 @@ urlpatterns = [
         name="run-getpublications-command",
     ),
     path("api/courses", CoursesView.as_view(), name="courses"),
+    path("api/courses/bulk", CoursesBulkView.as_view(), name="courses-bulk"),
     path("api/events", EventsView.as_view(), name="events"),
+    path("api/events/bulk", EventsBulkView.as_view(), name="events-bulk"),
     path("api/validate-invitation-token", ValidateInvitationTokenView.as_view()),
     path("api/send-mail-invitation", SendMailInvitationView.as_view()),
+    path("api/send-bulk-invitations", SendBulkInvitationsView.as_view()),
     path("api/invitations", InvitationAPIView.as_view()),
+    path("api/invitations/stats", InvitationStatsView.as_view()),
     path("api/invitation/<int:id>", InvitationAPIView.as_view()),
+    path("api/stats", LabStatisticsView.as_view(), name="stats"),
+    path("metrics", metrics_view, name="metrics"),
 ]
+
+if settings.SWAGGER_ENABLED:
+    from backend.views.openapi_views import openapi_schema_view, swagger_ui_view
+
+    urlpatterns += [path("openapi.json", openapi_schema_view, name="openapi-schema")]
+    if settings.DEBUG:
+        from drf_yasg.views import get_schema_view
+        from rest_framework import permissions
+
+        # Introspects the views on each visit, so the schema follows the changes of the code
+        schema_view = get_schema_view(public=True, permission_classes=[permissions.AllowAny])
+        urlpatterns += [path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="swagger")]
+    else:
+        urlpatterns += [path("swagger/", swagger_ui_view, name="swagger")]
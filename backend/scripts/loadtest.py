@@ -0,0 +1,57 @@
+"""
+Small load test with the standard library only, to compare the serving modes.
+
+    python scripts/loadtest.py http://localhost:8000/api/researches --concurrency 16 --duration 20
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def worker(url, deadline, latencies, errors, lock):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+            ok = True
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", "-c", type=int, default=16)
+    parser.add_argument("--duration", "-d", type=float, default=20, help="Duration of the test in seconds.")
+    args = parser.parse_args()
+
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=worker, args=(args.url, deadline, latencies, errors, lock)) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if not latencies:
+        print(f"All {len(errors)} requests failed")
+        return
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Requests:   {len(latencies)} ok, {len(errors)} failed")
+    print(f"Throughput: {len(latencies) / args.duration:.1f} req/s")
+    print(f"Latency:    p50 {quantiles[49] * 1000:.1f}ms, p95 {quantiles[94] * 1000:.1f}ms, p99 {quantiles[98] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()